@@ -1,19 +1,65 @@
 import streamlit as st
 import polars as pl
+import pyarrow.parquet as pq
 import os
 import sys
+import uuid
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.generator import ForgeEngine
-from core.llm_logic import LLMLogicEngine
-from core.sinks import get_sink, LocalSink
-from app.ui_schema import infer_schema, render_schema_editor, read_full_dataframe
+from core.llm_logic import LLMLogicEngine, DEFAULT_MODEL
+from core.sinks import get_sink, DEFAULT_RECORDS_PER_FILE
+from app.ui_schema import infer_schema, render_schema_editor, read_full_dataframe, session_temp_dir
 from app.ui_privacy import render_privacy_scorecard
 from app.ui_relational import render_relational_tab
 from app.ui_time_travel import render_time_travel_tab
 
+
+@st.cache_resource
+def get_forge_engine() -> ForgeEngine:
+    """Shared ForgeEngine, constructed once per server process."""
+    return ForgeEngine()
+
+
+@st.cache_resource
+def get_llm_engine(model: str = DEFAULT_MODEL) -> LLMLogicEngine:
+    """
+    Shared LLMLogicEngine per model; its HTTP session keeps Ollama connections alive across reruns.
+
+    Engines are never mutated, so one session's model choice can't leak into another's.
+    """
+    return LLMLogicEngine(model=model)
+
+
+def session_spill_path() -> str:
+    """Per-session Parquet file holding the last generated frame (keeps it off the server heap)."""
+    return os.path.join(session_temp_dir(), "generated.parquet")
+
+
+def spill_chunks(chunks, path: str, stats: dict):
+    """
+    Pass chunks through while appending each one to a zstd Parquet file at `path`.
+
+    Records the row count and a 20-row preview in `stats`.
+    """
+    writer = None
+    stats.update(rows=0, preview=None)
+    try:
+        for chunk in chunks:
+            table = chunk.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+                stats["preview"] = chunk.head(20)
+            writer.write_table(table.cast(writer.schema))
+            stats["rows"] += len(chunk)
+            yield chunk
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 # --- Page Config ---
 st.set_page_config(
     page_title="ForgeFlow AI — Synthetic Data Forge",
@@ -39,8 +85,8 @@ with tab_single:
 
     # --- File Upload ---
     uploaded_file = st.file_uploader(
-        "Drop a CSV or Parquet file to infer schema",
-        type=["csv", "parquet"],
+        "Drop a CSV, Parquet or JSON file to infer schema",
+        type=["csv", "parquet", "json", "jsonl"],
         key="single_upload",
     )
 
@@ -50,12 +96,13 @@ with tab_single:
         st.session_state.single_file = uploaded_file
 
         with st.expander("📄 Sample Data (first 5 rows)", expanded=False):
-            st.dataframe(sample_df, use_container_width=True)
+            st.dataframe(sample_df.head(20), use_container_width=True)
 
     if "single_schema" in st.session_state and st.session_state.single_schema:
         # --- Schema Editor ---
         st.subheader("📋 Verify & Edit Schema")
         edited_schema = render_schema_editor(st.session_state.single_schema, key_prefix="single")
+        schema_keys = tuple(edited_schema)
 
         # --- Generation Settings ---
         st.divider()
@@ -63,14 +110,19 @@ with tab_single:
 
         col1, col2, col3 = st.columns(3)
         total_rec = col1.number_input("Total Records", value=1000, min_value=1, key="single_total")
-        rec_per_file = col2.number_input("Records Per File", value=250, min_value=1, key="single_rpp")
+        rec_per_file = col2.number_input("Records Per File", value=DEFAULT_RECORDS_PER_FILE, min_value=1, key="single_rpp")
         output_format = col3.selectbox("Output Format", ["parquet", "csv", "json"], key="single_fmt")
 
         partition_on = st.multiselect(
             "Partition Columns (Hive-style nesting)",
-            options=list(edited_schema.keys()),
+            options=schema_keys,
             key="single_partitions",
         )
+        if partition_on and output_format == "parquet":
+            st.caption(
+                "ℹ️ Partitioned Parquet stores partition columns only in the directory names; "
+                "read it back with `pl.scan_parquet(path, hive_partitioning=True)` to restore them."
+            )
 
         # --- Sink Selection ---
         st.divider()
@@ -95,7 +147,8 @@ with tab_single:
         st.divider()
         st.subheader("🧠 Business Logic Rules (LLM-Powered)")
 
-        llm_engine = LLMLogicEngine()
+        llm_engine = get_llm_engine()
+        # The engine caches its /api/tags probe for TAGS_TTL_SECONDS
         ollama_available = llm_engine.is_available()
 
         if ollama_available:
@@ -103,7 +156,7 @@ with tab_single:
             models = llm_engine.get_available_models()
             if models:
                 selected_model = st.selectbox("LLM Model", models, key="llm_model")
-                llm_engine.model = selected_model
+                llm_engine = get_llm_engine(selected_model)
         else:
             st.warning(
                 "⚠️ Ollama is not running. Start it with `docker compose up -d` "
@@ -111,6 +164,26 @@ with tab_single:
                 "Rules below will be skipped."
             )
 
+        # --- Smart LLM Generation ---
+        use_llm = False
+        replay_llm = False
+        field_descriptions = {}
+        if ollama_available:
+            use_llm = st.checkbox(
+                "✨ Smart LLM Generation — let the model generate field values (batched per request)",
+                key="single_use_llm",
+            )
+            if use_llm:
+                st.caption("Optionally describe each field to guide the model.")
+                field_descriptions = {
+                    col: st.text_input(f"Description for `{col}`", key=f"desc_{col}")
+                    for col in schema_keys
+                }
+                replay_llm = st.checkbox(
+                    "♻️ Replay this session's cached LLM records for the same schema (faster, but repeats data)",
+                    key="single_replay_llm",
+                )
+
         rules_text = st.text_area(
             "Enter rules in natural language (one per line)",
             placeholder="discount_price must be less than original_price\nship_date must be after order_date\nage must be between 18 and 65",
@@ -122,45 +195,57 @@ with tab_single:
         st.divider()
         if st.button("🚀 Generate Data", key="single_gen", type="primary"):
 
-            engine = ForgeEngine()
-            with st.spinner("Forging synthetic data..."):
-                df = engine.generate_records(edited_schema, total_rec)
+            engine = get_forge_engine()
+            rules = [r.strip() for r in rules_text.strip().split("\n") if r.strip()]
+            llm_kwargs = {"use_llm": use_llm, "field_descriptions": field_descriptions, "llm_engine": llm_engine}
+            if replay_llm:
+                # The engine is shared by every session; scope replayed records to this one
+                llm_kwargs["llm_cache_scope"] = st.session_state.setdefault("session_id", uuid.uuid4().hex)
 
-            # Apply business logic rules (fallback patterns work without LLM)
-            if rules_text.strip():
-                rules = [r.strip() for r in rules_text.strip().split("\n") if r.strip()]
+            if rules:
+                # Rules need the full frame (one translation pass, whole-frame compliance)
+                with st.spinner("Forging synthetic data..."):
+                    df = engine.generate_records(edited_schema, total_rec, **llm_kwargs)
+
+                # Apply business logic rules (fallback patterns work without LLM)
                 with st.spinner("Applying business logic rules..."):
                     df, rule_results = llm_engine.apply_rules(df, rules, edited_schema)
 
-                # Show rule results
-                for res in rule_results:
-                    if res["success"]:
-                        compliance = res.get("compliance_rate", "N/A")
-                        regenerated = res.get("rows_regenerated", 0)
-                        st.info(f"✅ **{res['rule']}** → `{res['lambda']}` | Compliance: {compliance} | Regenerated: {regenerated} rows")
-                    else:
-                        st.warning(f"⚠️ **{res['rule']}** — {res['error']}")
+                # Show rule results in a single table render
+                if rule_results:
+                    st.dataframe(pl.DataFrame(rule_results), use_container_width=True)
+
+                chunks = iter([df])
+            else:
+                # Stream file-sized chunks so generation overlaps with writes
+                chunks = engine.iter_records(edited_schema, total_rec, rec_per_file, **llm_kwargs)
+
+            spill_file = session_spill_path()
+            stats = {"rows": 0, "preview": None}
+            spilled = spill_chunks(chunks, spill_file, stats)
 
             # Write output
-            with st.spinner("Writing output files..."):
+            with st.spinner("Forging and writing output files..."):
                 if sink_type == "Local Filesystem":
                     sink = get_sink("local")
                     resolved = os.path.abspath(os.path.expanduser(output_path))
-                    written = sink.push(df, resolved, output_format, rec_per_file, partition_on or None)
-                    st.success(f"✅ Generated {len(df):,} records → `{resolved}` ({len(written)} files)")
+                    written = sink.push_stream(spilled, resolved, output_format, rec_per_file, partition_on or None)
+                    st.success(f"✅ Generated {stats['rows']:,} records → `{resolved}` ({len(written)} files)")
                 else:
                     try:
                         sink = get_sink("s3", bucket=s3_bucket, prefix=s3_prefix, region=s3_region)
-                        written = sink.push(df, "", output_format, rec_per_file, partition_on or None)
-                        st.success(f"✅ Pushed {len(df):,} records to S3 ({len(written)} files)")
+                        written = sink.push_stream(spilled, "", output_format, rec_per_file, partition_on or None)
+                        st.success(f"✅ Pushed {stats['rows']:,} records to S3 ({len(written)} files)")
                     except Exception as e:
                         st.error(f"❌ S3 push failed: {str(e)}")
+            spilled.close()
 
-            # Store for privacy tab
-            st.session_state.generated_df = df
+            # Store only the spill path for the privacy tab
+            if stats["rows"]:
+                st.session_state.generated_df_path = spill_file
 
-            with st.expander("📊 Preview (first 20 rows)"):
-                st.dataframe(df.head(20), use_container_width=True)
+                with st.expander("📊 Preview (first 20 rows)"):
+                    st.dataframe(stats["preview"], use_container_width=True)
 
 # ======================================================================
 # TAB 2: Multi-Table (Hydra)
@@ -184,11 +269,12 @@ with tab_privacy:
 
     with col_real:
         st.subheader("📁 Real Data")
-        real_file = st.file_uploader("Upload original (real) data", type=["csv", "parquet"], key="priv_real")
+        real_file = st.file_uploader("Upload original (real) data", type=["csv", "parquet", "json", "jsonl"], key="priv_real")
         real_df = None
         if real_file:
             real_df = read_full_dataframe(real_file)
-            st.caption(f"{len(real_df):,} rows × {len(real_df.columns)} columns")
+            real_rows = real_df.select(pl.len()).collect().item()
+            st.caption(f"{real_rows:,} rows × {len(real_df.collect_schema())} columns")
 
     with col_syn:
         st.subheader("🔬 Synthetic Data")
@@ -196,14 +282,16 @@ with tab_privacy:
 
         syn_df = None
         if syn_source == "Upload file":
-            syn_file = st.file_uploader("Upload synthetic data", type=["csv", "parquet"], key="priv_syn")
+            syn_file = st.file_uploader("Upload synthetic data", type=["csv", "parquet", "json", "jsonl"], key="priv_syn")
             if syn_file:
                 syn_df = read_full_dataframe(syn_file)
-                st.caption(f"{len(syn_df):,} rows × {len(syn_df.columns)} columns")
+                syn_rows = syn_df.select(pl.len()).collect().item()
+                st.caption(f"{syn_rows:,} rows × {len(syn_df.collect_schema())} columns")
         else:
-            if "generated_df" in st.session_state:
-                syn_df = st.session_state.generated_df
-                st.caption(f"{len(syn_df):,} rows × {len(syn_df.columns)} columns (from last generation)")
+            if "generated_df_path" in st.session_state and os.path.exists(st.session_state.generated_df_path):
+                syn_df = pl.scan_parquet(st.session_state.generated_df_path)
+                syn_rows = syn_df.select(pl.len()).collect().item()
+                st.caption(f"{syn_rows:,} rows × {len(syn_df.collect_schema())} columns (from last generation)")
             else:
                 st.info("No data generated yet. Generate data in the Single Table tab first.")
 
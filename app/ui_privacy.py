@@ -7,11 +7,12 @@ Displays DCR metrics, risk assessment, and distribution histogram.
 import streamlit as st
 import polars as pl
 import numpy as np
+import altair as alt
 from core.privacy import PrivacyScorecard
 
 
-def render_privacy_scorecard(real_df: pl.DataFrame, synthetic_df: pl.DataFrame):
-    """Render the full privacy scorecard dashboard."""
+def render_privacy_scorecard(real_df, synthetic_df):
+    """Render the full privacy scorecard dashboard (accepts DataFrames or LazyFrames)."""
     scorecard = PrivacyScorecard()
 
     with st.spinner("Computing DCR metrics..."):
@@ -40,13 +41,18 @@ def render_privacy_scorecard(real_df: pl.DataFrame, synthetic_df: pl.DataFrame):
     # Histogram
     st.subheader("DCR Distribution")
     dcr_values = results.get("dcr_values", [])
-    if dcr_values:
+    if len(dcr_values):
         hist_values, bin_edges = np.histogram(dcr_values, bins=30)
         chart_data = pl.DataFrame({
-            "DCR Range": [f"{bin_edges[i]:.3f}" for i in range(len(hist_values))],
-            "Count": hist_values.tolist(),
+            "DCR Range": pl.from_numpy(bin_edges[:-1]).to_series().round(3).cast(pl.Utf8),
+            "Count": hist_values,
         })
-        st.bar_chart(chart_data, x="DCR Range", y="Count")
+        # Pre-binned data: the Vega spec carries only the bins, no client-side aggregation
+        chart = alt.Chart(chart_data).mark_bar().encode(
+            x=alt.X("DCR Range:O", sort=None),
+            y="Count:Q",
+        )
+        st.altair_chart(chart, use_container_width=True)
 
     # Details expander
     with st.expander("📊 Detailed Metrics"):
@@ -57,6 +63,6 @@ def render_privacy_scorecard(real_df: pl.DataFrame, synthetic_df: pl.DataFrame):
             "std_dcr": results["std_dcr"],
             "pct_exact_matches": results["pct_exact_matches"],
             "risk_level": results["risk_level"],
-            "real_rows_analyzed": len(real_df),
-            "synthetic_rows_analyzed": len(synthetic_df),
+            "real_rows_analyzed": results["real_rows_analyzed"],
+            "synthetic_rows_analyzed": results["synthetic_rows_analyzed"],
         })
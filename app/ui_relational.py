@@ -6,22 +6,21 @@ and generate referentially-consistent synthetic data.
 """
 
 import streamlit as st
-import polars as pl
-from app.ui_schema import infer_schema, render_schema_editor
+from app.ui_schema import infer_schema, render_multi_schema_editor
 from core.relational import RelationalEngine
-from core.sinks import LocalSink
+from core.sinks import LocalSink, DEFAULT_RECORDS_PER_FILE
 import os
 
 
 def render_relational_tab():
     """Render the Hydra multi-table generation interface."""
 
-    st.markdown("Upload multiple CSV/Parquet files to generate related synthetic datasets with FK integrity.")
+    st.markdown("Upload multiple CSV/Parquet/JSON files to generate related synthetic datasets with FK integrity.")
 
     # --- File Upload ---
     uploaded_files = st.file_uploader(
         "Upload related tables",
-        type=["csv", "parquet"],
+        type=["csv", "parquet", "json", "jsonl"],
         accept_multiple_files=True,
         key="multi_upload",
     )
@@ -45,16 +44,12 @@ def render_relational_tab():
     # --- Display schemas ---
     st.subheader("📋 Table Schemas")
     table_names = list(st.session_state.multi_schemas.keys())
+    schemas = render_multi_schema_editor(st.session_state.multi_schemas)
 
     for tname in table_names:
-        with st.expander(f"📄 {tname}", expanded=True):
-            schema = st.session_state.multi_schemas[tname]
-            edited = render_schema_editor(schema, key_prefix=f"multi_{tname}")
-            st.session_state.multi_schemas[tname] = edited
-
-            # Show sample
-            if tname in st.session_state.multi_samples:
-                st.dataframe(st.session_state.multi_samples[tname], use_container_width=True)
+        if tname in st.session_state.multi_samples:
+            with st.expander(f"📄 {tname} sample", expanded=False):
+                st.dataframe(st.session_state.multi_samples[tname].head(20), use_container_width=True)
 
     # --- Define Relationships ---
     st.subheader("🔗 Define Relationships")
@@ -67,7 +62,7 @@ def render_relational_tab():
     parent_table = col1.selectbox("Parent Table", table_names, key="rel_parent")
     parent_col = col2.selectbox(
         "Parent Column",
-        list(st.session_state.multi_schemas.get(parent_table, {}).keys()),
+        list(schemas.get(parent_table, {}).keys()),
         key="rel_pcol",
     )
     child_table = col3.selectbox(
@@ -77,7 +72,7 @@ def render_relational_tab():
     ) if len(table_names) > 1 else col3.selectbox("Child Table", table_names, key="rel_child")
     child_col = col4.selectbox(
         "Child Column",
-        list(st.session_state.multi_schemas.get(child_table, {}).keys()) if child_table else [],
+        list(schemas.get(child_table, {}).keys()) if child_table else [],
         key="rel_ccol",
     )
 
@@ -117,7 +112,7 @@ def render_relational_tab():
 
     col_fmt, col_rpp = st.columns(2)
     output_format = col_fmt.selectbox("Output Format", ["parquet", "csv", "json"], key="multi_fmt")
-    records_per_file = col_rpp.number_input("Records Per File", value=250, min_value=1, key="multi_rpp")
+    records_per_file = col_rpp.number_input("Records Per File", value=DEFAULT_RECORDS_PER_FILE, min_value=1, key="multi_rpp")
 
     output_path = st.text_input(
         "Output Directory",
@@ -129,7 +124,7 @@ def render_relational_tab():
     if st.button("🚀 Generate All Tables", key="multi_gen"):
         engine = RelationalEngine()
 
-        for tname, schema in st.session_state.multi_schemas.items():
+        for tname, schema in schemas.items():
             engine.add_table(tname, schema)
 
         for pt, pc, ct, cc in st.session_state.relationships:
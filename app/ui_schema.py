@@ -4,60 +4,175 @@ Reusable Schema Editor UI Component.
 Provides schema inference and interactive editing for uploaded files.
 """
 
+import atexit
+import io
+import itertools
+import os
+import shutil
+import tempfile
+from pathlib import Path
 import streamlit as st
 import polars as pl
 
 
 def infer_schema(uploaded_file) -> dict:
-    """Infer schema from an uploaded CSV or Parquet file."""
-    if uploaded_file.name.endswith("csv"):
-        df = pl.read_csv(uploaded_file, n_rows=5)
+    """Infer schema from an uploaded CSV, Parquet, JSON or JSONL file (reads only the first 5 rows)."""
+    path = spill_upload(uploaded_file)
+    return _infer_schema_cached((uploaded_file.file_id, uploaded_file.size), uploaded_file.name, path)
+
+
+@st.cache_data(show_spinner=False)
+def _infer_schema_cached(file_key: tuple, name: str, _path: str) -> tuple:
+    """Cached schema inference keyed on (file_id, size); the file itself is not hashed."""
+    if Path(name).suffix.lower() == ".jsonl":
+        # Hand Polars only the first 5 lines rather than a scan over the whole file
+        with open(_path, "rb") as fh:
+            df = pl.read_ndjson(io.BytesIO(b"".join(itertools.islice(fh, 5))))
     else:
-        df = pl.read_parquet(uploaded_file)
-        if len(df) > 5:
-            df = df.head(5)
+        df = _scan(_path, name).head(5).collect()
     return {col: str(dtype) for col, dtype in zip(df.columns, df.dtypes)}, df
 
 
+TYPE_OPTIONS = ["Int64", "Float64", "String", "Date"]
+
+
+def _default_type(dtype: str) -> str:
+    """Map an inferred Polars dtype string onto one of TYPE_OPTIONS."""
+    if "Int" in dtype:
+        return "Int64"
+    elif "Float" in dtype:
+        return "Float64"
+    elif "Date" in dtype or "Datetime" in dtype:
+        return "Date"
+    else:
+        return "String"
+
+
 def render_schema_editor(schema: dict, key_prefix: str = "") -> dict:
     """
     Render an interactive schema editor.
 
+    Uses a single data editor (one widget regardless of column count).
     Returns the edited schema dict.
     """
-    TYPE_OPTIONS = ["Int64", "Float64", "String", "Date"]
-
-    edited_schema = {}
-    num_cols = min(len(schema), 4)
-    cols = st.columns(num_cols) if num_cols > 0 else []
-
-    for i, (col_name, dtype) in enumerate(schema.items()):
-        with cols[i % num_cols] if cols else st.container():
-            # Determine default index
-            if "Int" in dtype:
-                default_idx = 0
-            elif "Float" in dtype:
-                default_idx = 1
-            elif "Date" in dtype or "Datetime" in dtype:
-                default_idx = 3
-            else:
-                default_idx = 2
-
-            new_type = st.selectbox(
-                f"📋 `{col_name}`",
-                TYPE_OPTIONS,
-                index=default_idx,
-                key=f"{key_prefix}_schema_{col_name}",
-            )
-            edited_schema[col_name] = new_type
-
-    return edited_schema
-
-
-def read_full_dataframe(uploaded_file) -> pl.DataFrame:
-    """Read the full uploaded file into a DataFrame."""
-    uploaded_file.seek(0)
-    if uploaded_file.name.endswith("csv"):
-        return pl.read_csv(uploaded_file)
+    # data_editor takes (and returns) Arrow tables, not Polars frames
+    schema_df = pl.DataFrame({
+        "column": list(schema),
+        "type": [_default_type(dtype) for dtype in schema.values()],
+    })
+    edited = st.data_editor(
+        schema_df.to_arrow(),
+        column_config={
+            "column": st.column_config.TextColumn("Column", disabled=True),
+            "type": st.column_config.SelectboxColumn("Type", options=TYPE_OPTIONS, required=True),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key=f"{key_prefix}_schema_editor",
+    )
+
+    edited = pl.from_arrow(edited)
+    return dict(zip(edited["column"], edited["type"]))
+
+
+def render_multi_schema_editor(schemas: dict, key: str = "multi_schema_editor") -> dict:
+    """
+    Render one editor for several tables' schemas (long form: table, column, type).
+
+    Returns a dict mapping table name -> edited schema dict.
+    """
+    schemas_df = pl.DataFrame({
+        "table": [table for table, schema in schemas.items() for _ in schema],
+        "column": [col for schema in schemas.values() for col in schema],
+        "type": [_default_type(dtype) for schema in schemas.values() for dtype in schema.values()],
+    })
+    edited = st.data_editor(
+        schemas_df.to_arrow(),
+        column_config={
+            "table": st.column_config.TextColumn("Table", disabled=True),
+            "column": st.column_config.TextColumn("Column", disabled=True),
+            "type": st.column_config.SelectboxColumn("Type", options=TYPE_OPTIONS, required=True),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key=key,
+    )
+
+    edited_schemas = {table: {} for table in schemas}
+    for table, col, dtype in pl.from_arrow(edited).iter_rows():
+        edited_schemas[table][col] = dtype
+    return edited_schemas
+
+
+def read_full_dataframe(uploaded_file) -> pl.LazyFrame:
+    """
+    Lazily scan the full uploaded file.
+
+    Consumers select the columns they need and collect with the streaming engine.
+    """
+    return _scan(spill_upload(uploaded_file), uploaded_file.name)
+
+
+def spill_upload(uploaded_file) -> str:
+    """
+    Copy an upload to a temp file (once per file_id) and return its path.
+
+    Polars then scans / memory-maps the file from disk instead of decoding
+    a second in-memory copy of the upload. Spills of uploads no longer held
+    by any uploader widget are deleted before a new one is written.
+    """
+    if "upload_spills" not in st.session_state:
+        st.session_state.upload_spills = {}
+    spills = st.session_state.upload_spills
+
+    path = spills.get(uploaded_file.file_id)
+    if path is None or not os.path.exists(path):
+        _prune_spills(spills)
+        uploaded_file.seek(0)
+        with tempfile.NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix,
+                                         dir=session_temp_dir(), delete=False) as tmp:
+            shutil.copyfileobj(uploaded_file, tmp)
+        path = tmp.name
+        spills[uploaded_file.file_id] = path
+    return path
+
+
+def _prune_spills(spills: dict):
+    """Delete spilled copies of uploads that were removed or replaced in their widgets."""
+    live_ids = set()
+    for value in st.session_state.values():
+        for item in value if isinstance(value, list) else [value]:
+            file_id = getattr(item, "file_id", None)
+            if file_id is not None:
+                live_ids.add(file_id)
+    for file_id in [file_id for file_id in spills if file_id not in live_ids]:
+        try:
+            os.remove(spills.pop(file_id))
+        except OSError:
+            pass
+
+
+def session_temp_dir() -> str:
+    """Per-session directory for spilled files, removed when the server exits."""
+    path = st.session_state.get("temp_dir")
+    if path is None or not os.path.isdir(path):
+        path = tempfile.mkdtemp(prefix="forge_")
+        atexit.register(shutil.rmtree, path, ignore_errors=True)
+        st.session_state.temp_dir = path
+    return path
+
+
+def _scan(source, name: str) -> pl.LazyFrame:
+    """Dispatch to the Polars reader matching the file extension."""
+    suffix = Path(name).suffix.lower()
+    if suffix == ".csv":
+        return pl.scan_csv(source)
+    elif suffix == ".jsonl":
+        return pl.scan_ndjson(source)
+    elif suffix == ".json":
+        # JSON arrays cannot be scanned lazily; parse once with a bounded inference window
+        return pl.read_json(source, infer_schema_length=1000).lazy()
+    elif suffix == ".parquet":
+        return pl.scan_parquet(source)
     else:
-        return pl.read_parquet(uploaded_file)
+        raise ValueError(f"Unsupported file type: {suffix or name}")
@@ -7,13 +7,61 @@ and preview volume distribution before generating.
 
 import streamlit as st
 import polars as pl
-from datetime import date, timedelta
+from datetime import date
 from app.ui_schema import infer_schema, render_schema_editor
 from core.time_travel import TimeTravelEngine
-from core.sinks import LocalSink
+from core.sinks import LocalSink, DEFAULT_RECORDS_PER_FILE
 import os
 
 
+@st.cache_resource
+def get_time_travel_engine() -> TimeTravelEngine:
+    """Shared TimeTravelEngine, constructed once per server process."""
+    return TimeTravelEngine()
+
+
+@st.cache_data(show_spinner=False)
+def volume_preview(base_count, start_date, end_date, frequency, trend_pct, spikes: tuple) -> list:
+    """Volume preview keyed on the temporal settings, so unrelated reruns skip the recompute."""
+    return get_time_travel_engine().get_volume_preview(
+        base_count=base_count,
+        start_date=start_date,
+        end_date=end_date,
+        frequency=frequency,
+        trend_pct=trend_pct,
+        spike_dates=list(spikes),
+    )
+
+
+def _parse_spikes(edited: pl.DataFrame) -> list:
+    """
+    (date, multiplier) pairs from the spike editor.
+
+    Rows added to an empty editor come back with string dates (ISO dates or
+    datetimes); temporal columns are cast directly. Rows whose date can't be
+    parsed are reported with st.warning rather than dropped silently.
+    """
+    if edited.schema["date"].is_temporal():
+        parsed = pl.col("date").cast(pl.Date)
+    else:
+        raw = pl.col("date").cast(pl.String).str.strip_chars()
+        parsed = pl.coalesce(
+            raw.str.to_date("%Y-%m-%d", strict=False),
+            raw.str.to_datetime(strict=False).dt.date(),
+        )
+    spikes = edited.select(
+        pl.col("date").cast(pl.String).alias("raw"),
+        parsed.alias("date"),
+        pl.col("multiplier").cast(pl.Float64),
+    )
+
+    unparsed = spikes.filter(pl.col("raw").is_not_null() & pl.col("date").is_null())["raw"].to_list()
+    if unparsed:
+        st.warning(f"⚠️ Ignoring spikes with unrecognised dates (use YYYY-MM-DD): {', '.join(unparsed)}")
+    # Rows still being filled in (no date or multiplier yet) are skipped quietly
+    return list(spikes.select("date", "multiplier").drop_nulls().iter_rows())
+
+
 def render_time_travel_tab():
     """Render the time-travel simulation interface."""
 
@@ -22,7 +70,7 @@ def render_time_travel_tab():
     # --- File Upload ---
     uploaded_file = st.file_uploader(
         "Upload a sample file to infer schema",
-        type=["csv", "parquet"],
+        type=["csv", "parquet", "json", "jsonl"],
         key="tt_upload",
     )
 
@@ -54,39 +102,29 @@ def render_time_travel_tab():
 
     # --- Spike Configuration ---
     st.subheader("📈 Volume Spikes")
-    st.markdown("Add date-specific volume multipliers (e.g., Black Friday = 3× volume).")
-
-    if "tt_spikes" not in st.session_state:
-        st.session_state.tt_spikes = []
-
-    spike_col1, spike_col2 = st.columns(2)
-    spike_date = spike_col1.date_input("Spike Date", value=date(2024, 11, 29), key="tt_spike_date")
-    spike_mult = spike_col2.number_input("Multiplier", value=3.0, min_value=1.0, step=0.5, key="tt_spike_mult")
-
-    if st.button("➕ Add Spike", key="tt_add_spike"):
-        st.session_state.tt_spikes.append((spike_date, spike_mult))
-
-    if st.session_state.tt_spikes:
-        for i, (sd, sm) in enumerate(st.session_state.tt_spikes):
-            col_a, col_b = st.columns([4, 1])
-            col_a.markdown(f"📌 **{sd.isoformat()}** — {sm}× volume")
-            if col_b.button("🗑️", key=f"del_spike_{i}"):
-                st.session_state.tt_spikes.pop(i)
-                st.rerun()
+    st.markdown("Add date-specific volume multipliers (e.g., Black Friday = 3× volume) as rows in the table below.")
+
+    # One editable table (rows are added/removed in place, no per-spike buttons or reruns)
+    spikes_df = pl.DataFrame(schema={"date": pl.Date, "multiplier": pl.Float64})
+    edited = st.data_editor(
+        spikes_df.to_arrow(),
+        column_config={
+            "date": st.column_config.DateColumn("Spike Date", required=True),
+            "multiplier": st.column_config.NumberColumn("Multiplier", min_value=1.0, step=0.5, default=3.0, required=True),
+        },
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        key="tt_spike_editor",
+    )
+    st.session_state.tt_spikes = _parse_spikes(pl.from_arrow(edited))
 
     # --- Volume Preview Chart ---
     st.divider()
     st.subheader("📊 Volume Preview")
 
-    engine = TimeTravelEngine()
-    preview = engine.get_volume_preview(
-        base_count=base_count,
-        start_date=start_date,
-        end_date=end_date,
-        frequency=frequency,
-        trend_pct=trend_pct,
-        spike_dates=st.session_state.tt_spikes,
-    )
+    engine = get_time_travel_engine()
+    preview = volume_preview(base_count, start_date, end_date, frequency, trend_pct, tuple(st.session_state.tt_spikes))
 
     if preview:
         preview_df = pl.DataFrame(preview)
@@ -98,29 +136,43 @@ def render_time_travel_tab():
     st.divider()
     col_fmt, col_rpp = st.columns(2)
     output_format = col_fmt.selectbox("Output Format", ["parquet", "csv", "json"], key="tt_fmt")
-    records_per_file = col_rpp.number_input("Records Per File", value=500, min_value=1, key="tt_rpp")
+    records_per_file = col_rpp.number_input("Records Per File", value=DEFAULT_RECORDS_PER_FILE, min_value=1, key="tt_rpp")
+    if output_format == "parquet":
+        st.caption(
+            "ℹ️ Output is partitioned by `_period`, which Parquet stores only in the directory names; "
+            "read it back with `pl.scan_parquet(path, hive_partitioning=True)` to restore the column."
+        )
 
     output_path = st.text_input("Output Directory", value="./output_temporal", key="tt_output")
 
     # --- Generate ---
     if st.button("🚀 Generate Temporal Data", key="tt_gen"):
-        with st.spinner("Simulating time-travel data..."):
-            df = engine.generate_temporal(
-                schema=edited_schema,
-                base_count_per_period=base_count,
-                start_date=start_date,
-                end_date=end_date,
-                frequency=frequency,
-                trend_pct=trend_pct,
-                spike_dates=st.session_state.tt_spikes,
-            )
+        periods = engine.stream_temporal(
+            schema=edited_schema,
+            base_count_per_period=base_count,
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency,
+            trend_pct=trend_pct,
+            spike_dates=st.session_state.tt_spikes,
+        )
+        stats = {"rows": 0, "preview": None}
+
+        def tracked_periods():
+            for _, period_df in periods:
+                if stats["preview"] is None:
+                    stats["preview"] = period_df.head(20)
+                stats["rows"] += len(period_df)
+                yield period_df
 
         resolved_path = os.path.abspath(os.path.expanduser(output_path))
         sink = LocalSink()
-        # Partition by period
-        written = sink.push(df, resolved_path, output_format, records_per_file, partitions=["_period"])
+        # Each period is written (partitioned by period) while the next one is generated
+        with st.spinner("Simulating time-travel data..."):
+            sink.push_stream(tracked_periods(), resolved_path, output_format, records_per_file, partitions=["_period"])
 
-        st.success(f"✅ Generated {len(df):,} records across {len(preview)} periods to `{resolved_path}`")
+        st.success(f"✅ Generated {stats['rows']:,} records across {len(preview)} periods to `{resolved_path}`")
 
-        with st.expander("📊 Preview (first 20 rows)"):
-            st.dataframe(df.head(20), use_container_width=True)
+        if stats["preview"] is not None:
+            with st.expander("📊 Preview (first 20 rows)"):
+                st.dataframe(stats["preview"], use_container_width=True)
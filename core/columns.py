@@ -0,0 +1,58 @@
+"""
+Shared Column Generators.
+
+Vectorized Int/Float/Date/String column generation used by the single-table,
+relational and time-travel engines, plus the constants they share.
+"""
+
+import polars as pl
+import numpy as np
+from faker import Faker
+from datetime import date
+from functools import lru_cache
+
+EPOCH = date(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+WORD_POOL_SIZE = 5000
+
+# One Faker for every engine: building one loads all provider modules. Calls only
+# draw from Faker's shared random.Random, so concurrent use is safe (values interleave).
+SHARED_FAKER = Faker()
+
+
+@lru_cache(maxsize=1)
+def word_pool() -> np.ndarray:
+    """Faker word pool, drawn once per process and sampled for String columns."""
+    return np.array(SHARED_FAKER.words(nb=WORD_POOL_SIZE), dtype=object)
+
+
+def random_dates(rng: np.random.Generator, count: int, start: date = None, end: date = None) -> pl.Series:
+    """
+    Uniform random dates in [start, end].
+
+    Defaults to the current decade up to today (like fake.date_this_decade).
+    """
+    if end is None:
+        end = date.today()
+    if start is None:
+        start = date(end.year - end.year % 10, 1, 1)
+    ordinals = rng.integers(start.toordinal(), end.toordinal() + 1, count)
+    return pl.Series(ordinals - EPOCH_ORDINAL, dtype=pl.Int32).cast(pl.Date)
+
+
+def random_column(rng: np.random.Generator, dtype: str, count: int,
+                  start: date = None, end: date = None):
+    """
+    Generate `count` fake values of a type string in one NumPy call.
+
+    Date columns fall in [start, end] (see random_dates); String columns are
+    sampled from the shared word pool.
+    """
+    if "Int" in dtype:
+        return rng.integers(0, 10001, count)
+    elif "Float" in dtype:
+        return np.round(rng.uniform(0, 10000, count), 2)
+    elif "Date" in dtype:
+        return random_dates(rng, count, start, end)
+    else:
+        return pl.Series(rng.choice(word_pool(), size=count), dtype=pl.String)
@@ -5,9 +5,16 @@ Uses smart Faker providers that detect column semantics from names
 (e.g., 'email' → fake.email(), 'phone' → fake.phone_number()).
 """
 
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import polars as pl
+import numpy as np
 from faker import Faker
+from functools import lru_cache
 import re
+from core.columns import SHARED_FAKER, random_column
+from core.llm_logic import LLMLogicEngine
 
 
 # Map column name patterns to Faker providers
@@ -49,13 +56,31 @@ SMART_PROVIDERS = [
     (r"color|colour", lambda fake: fake.color_name()),
 ]
 
+# All SMART_PROVIDERS patterns as one regex: one lookahead per pattern, tried in
+# list order at position 0, so the first listed pattern that matches anywhere wins
+# (same precedence as scanning the list). The matching group is named g{index}.
+_SMART_PROVIDER_RE = re.compile(
+    "|".join(f"(?=.*?(?P<g{i}>{pattern}))" for i, (pattern, _) in enumerate(SMART_PROVIDERS))
+)
+_PROVIDERS_BY_INDEX = [provider for _, provider in SMART_PROVIDERS]
+
+# Below this many rows per worker, process start-up costs more than it saves
+PARALLEL_MIN_ROWS = 50_000
+
 
 class ForgeEngine:
     """Core synthetic data generation engine with smart column detection."""
 
-    def __init__(self):
-        self.fake = Faker()
-        self._provider_cache = {}
+    def __init__(self, seed: int = None):
+        """
+        Args:
+            seed: optional seed for reproducible output; seeds Faker's shared
+                random generator and this engine's NumPy generator
+        """
+        self.fake = SHARED_FAKER
+        if seed is not None:
+            Faker.seed(seed)
+        self._rng = np.random.default_rng(seed)
 
     def _get_provider(self, col_name: str, dtype: str):
         """
@@ -63,24 +88,10 @@ class ForgeEngine:
 
         First checks for smart name-based matching, then falls back to dtype.
         """
-        cache_key = (col_name.lower(), dtype)
-        if cache_key in self._provider_cache:
-            return self._provider_cache[cache_key]
-
-        # Try smart name-based matching (only for String columns)
-        if "String" in dtype or dtype in ("Utf8", "Categorical"):
-            col_lower = col_name.lower()
-            for pattern, provider in SMART_PROVIDERS:
-                if re.search(pattern, col_lower):
-                    self._provider_cache[cache_key] = provider
-                    return provider
-
-        # Fallback to dtype-based generation
-        provider = self._dtype_provider(dtype)
-        self._provider_cache[cache_key] = provider
-        return provider
-
-    def _dtype_provider(self, dtype: str):
+        return _resolve_provider(col_name.lower(), dtype)
+
+    @staticmethod
+    def _dtype_provider(dtype: str):
         """Default provider based on data type."""
         if "Int" in dtype:
             return lambda fake: fake.random_int(0, 10000)
@@ -91,17 +102,113 @@ class ForgeEngine:
         else:
             return lambda fake: fake.word()
 
-    def generate_records(self, schema: dict, count: int) -> pl.DataFrame:
-        """Generate a DataFrame with `count` rows using smart providers."""
-        # Pre-resolve providers for each column
-        providers = {
-            col: self._get_provider(col, dtype)
+    def _get_column_generator(self, col_name: str, dtype: str):
+        """
+        Get a batch generator `(count) -> column values` for a column.
+
+        Int/Float/Date columns are drawn in a single vectorized NumPy call;
+        string columns still use their Faker provider, once per value.
+        """
+        if any(kind in dtype for kind in ("Int", "Float", "Date")):
+            return lambda count: random_column(self._rng, dtype, count)
+
+        provider = self._get_provider(col_name, dtype)
+        return lambda count: pl.Series([provider(self.fake) for _ in range(count)], dtype=pl.String)
+
+    def generate_records(self, schema: dict, count: int, use_llm: bool = False,
+                         field_descriptions: dict = None,
+                         llm_engine: LLMLogicEngine = None,
+                         llm_offset: int = 0,
+                         llm_cache_scope: str = None) -> pl.DataFrame:
+        """
+        Generate a DataFrame with `count` rows using smart providers.
+
+        With use_llm=True, records are requested from the LLM in batches;
+        any shortfall (or an unreachable Ollama) is filled with Faker rows.
+        `llm_offset` is this frame's position in a larger run (see iter_records).
+        With `llm_cache_scope`, LLM records cached under that scope are replayed
+        (see LLMLogicEngine.generate_data); by default every call is fresh.
+        """
+        if use_llm:
+            llm = llm_engine or LLMLogicEngine()
+            records = llm.generate_data(schema, count, field_descriptions, offset=llm_offset,
+                                        use_cache=llm_cache_scope is not None,
+                                        cache_scope=llm_cache_scope or "")
+            if records:
+                df = self._records_to_frame(records, schema)
+                if len(df) < count:
+                    df = pl.concat([df, self._generate_faker(schema, count - len(df))], how="vertical_relaxed")
+                return df
+
+        return self._generate_faker(schema, count)
+
+    def _generate_faker(self, schema: dict, count: int) -> pl.DataFrame:
+        """
+        Generate `count` rows with Faker/NumPy.
+
+        Large frames with Faker-backed (string) columns are split across worker
+        processes, each with its own seeded engine; everything else runs inline.
+        """
+        n_workers = min(os.cpu_count() or 1, count // PARALLEL_MIN_ROWS)
+        has_faker_columns = any(
+            not any(kind in dtype for kind in ("Int", "Float", "Date")) for dtype in schema.values()
+        )
+        if n_workers > 1 and has_faker_columns:
+            return self._generate_parallel(schema, count, n_workers)
+        return self._generate_columns(schema, count)
+
+    def _generate_parallel(self, schema: dict, count: int, n_workers: int) -> pl.DataFrame:
+        """Generate `count` rows in `n_workers` processes, seeded from this engine's generator."""
+        sizes = [count // n_workers + (i < count % n_workers) for i in range(n_workers)]
+        seeds = self._rng.integers(0, 2**32, n_workers).tolist()
+        # spawn, not fork: forking a process that already runs Polars' thread pool can deadlock
+        with ProcessPoolExecutor(n_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            frames = list(pool.map(_generate_chunk, [schema] * n_workers, sizes, seeds))
+        return pl.concat(frames)
+
+    def _generate_columns(self, schema: dict, count: int) -> pl.DataFrame:
+        """Generate `count` rows column-at-a-time (no per-row dicts)."""
+        columns = {
+            col: self._get_column_generator(col, dtype)(count)
             for col, dtype in schema.items()
         }
+        return pl.DataFrame(columns)
+
+    @staticmethod
+    def _records_to_frame(records: list, schema: dict) -> pl.DataFrame:
+        """Build a typed DataFrame from LLM records; malformed values become null."""
+        columns = {}
+        for col, dtype in schema.items():
+            values = pl.Series(col, [None if r.get(col) is None else str(r.get(col)) for r in records],
+                               dtype=pl.String)
+            if "Int" in dtype:
+                values = values.cast(pl.Float64, strict=False).cast(pl.Int64, strict=False)
+            elif "Float" in dtype:
+                values = values.cast(pl.Float64, strict=False)
+            elif "Date" in dtype:
+                values = values.str.to_date(strict=False)
+            columns[col] = values
+        return pl.DataFrame(columns)
+
+    def iter_records(self, schema: dict, total: int, chunk: int = 250, **generate_kwargs):
+        """Yield DataFrames of at most `chunk` rows until `total` rows have been generated."""
+        for start in range(0, total, chunk):
+            yield self.generate_records(schema, min(chunk, total - start), llm_offset=start, **generate_kwargs)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_provider(col_lower: str, dtype: str):
+    """Provider lookup shared by every ForgeEngine, so each (column, dtype) is matched once per process."""
+    # Try smart name-based matching (only for String columns)
+    if "String" in dtype or dtype in ("Utf8", "Categorical"):
+        m = _SMART_PROVIDER_RE.match(col_lower)
+        if m:
+            return _PROVIDERS_BY_INDEX[int(m.lastgroup[1:])]
+
+    # Fallback to dtype-based generation
+    return ForgeEngine._dtype_provider(dtype)
 
-        data = []
-        for _ in range(count):
-            row = {col: provider(self.fake) for col, provider in providers.items()}
-            data.append(row)
 
-        return pl.DataFrame(data)
\ No newline at end of file
+def _generate_chunk(schema: dict, count: int, seed: int) -> pl.DataFrame:
+    """Worker-process entry point for ForgeEngine._generate_parallel."""
+    return ForgeEngine(seed=seed)._generate_columns(schema, count)
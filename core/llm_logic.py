@@ -2,20 +2,45 @@
 LLM-Powered Business Logic Injection Engine.
 
 Translates natural language rules into Python filter functions
-using a local Ollama LLM instance (via Docker).
+using a local Ollama LLM instance (via Docker), and can generate
+whole batches of records directly from the LLM.
 
 Includes a fallback regex-based rule parser for common patterns
 so simple rules work even without the LLM.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import hashlib
+import math
 import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import polars as pl
 
+try:
+    import orjson  # optional: C-native JSON parsing of LLM responses (pip install orjson)
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 DEFAULT_MODEL = "llama3"
+OLLAMA_TAGS_URL = "http://localhost:11434/api/tags"
+TAGS_TTL_SECONDS = 30
+
+# Markdown fences some models wrap responses in
+_FENCE_OPEN = re.compile(r"```(?:json)?\s*\n?")
+_FENCE_CLOSE = re.compile(r"\n?```")
+# Start of the records array in a `{"records": [...]}` generation response
+_RECORDS_KEY = re.compile(r'"records"\s*:\s*\[')
 
 SYSTEM_PROMPT = """You are a data validation code generator. Given a natural language rule about data columns, 
 return ONLY a Python lambda function that takes a dictionary (row) and returns True if the row satisfies the rule.
@@ -47,90 +72,475 @@ Rule: "status must be either active or pending"
 lambda row: row['status'] in ['active', 'pending']
 """
 
+BATCH_PROMPT = """You will receive several numbered rules at once. Translate EACH rule into a lambda
+following the instructions above, and respond with a JSON object of the form:
+{"lambdas": ["lambda row: ...", "lambda row: ..."]}
+The list must contain exactly one lambda per rule, in the same order as the rules.
+"""
+
+GENERATION_PROMPT = """You are a synthetic data generator. Produce realistic, varied records
+for the fields listed below. Respond ONLY with a JSON object of the form:
+{"records": [{"field": value, ...}, ...]}
+Every record must contain every listed field. Dates use the ISO format YYYY-MM-DD.
+"""
+
+DEFAULT_CONTEXT_LENGTH = 2048
+MAX_NUM_CTX = 8192
+MAX_BATCH_SIZE = 50
+# How long Ollama keeps the model loaded after a request (avoids a cold load per batch)
+DEFAULT_KEEP_ALIVE = "10m"
+# Generation cache bounds: distinct requests kept (LRU) and records held across all of them.
+# Requests reaching past the record cap are generated uncached.
+GENERATION_CACHE_MAX_ENTRIES = 16
+GENERATION_CACHE_MAX_RECORDS = 50_000
+
 
 # --- Fallback rule patterns (no LLM needed) ---
+# Each entry: (regex, lambda-string builder, equivalent Polars expression builder,
+#              whether the expression is only equivalent on numeric columns)
 FALLBACK_PATTERNS = [
     # "X must end with Y" / "X must end in Y"
     (r"(\w+).*?(?:must|should)\s+end\s+(?:with|in)\s+[\"']?([^\"']+)[\"']?",
-     lambda col, val: f"lambda row: str(row['{col}']).endswith('{val.strip()}')"),
+     lambda col, val: f"lambda row: str(row['{col}']).endswith('{val.strip()}')",
+     lambda col, val: pl.col(col).cast(pl.String).str.ends_with(val.strip()),
+     False),
 
     # "X must start with Y"
     (r"(\w+).*?(?:must|should)\s+start\s+with\s+[\"']?([^\"']+)[\"']?",
-     lambda col, val: f"lambda row: str(row['{col}']).startswith('{val.strip()}')"),
+     lambda col, val: f"lambda row: str(row['{col}']).startswith('{val.strip()}')",
+     lambda col, val: pl.col(col).cast(pl.String).str.starts_with(val.strip()),
+     False),
 
     # "X must contain Y"
     (r"(\w+).*?(?:must|should)\s+contain\s+[\"']?([^\"']+)[\"']?",
-     lambda col, val: f"lambda row: '{val.strip()}' in str(row['{col}'])"),
+     lambda col, val: f"lambda row: '{val.strip()}' in str(row['{col}'])",
+     lambda col, val: pl.col(col).cast(pl.String).str.contains(val.strip(), literal=True),
+     False),
 
     # "X must be greater than N"
     (r"(\w+).*?(?:must|should)\s+be\s+(?:greater|more)\s+than\s+(\d+(?:\.\d+)?)",
-     lambda col, val: f"lambda row: row['{col}'] > {val}"),
+     lambda col, val: f"lambda row: row['{col}'] > {val}",
+     lambda col, val: pl.col(col) > float(val),
+     True),
 
     # "X must be less than N"
     (r"(\w+).*?(?:must|should)\s+be\s+(?:less|smaller)\s+than\s+(\d+(?:\.\d+)?)",
-     lambda col, val: f"lambda row: row['{col}'] < {val}"),
+     lambda col, val: f"lambda row: row['{col}'] < {val}",
+     lambda col, val: pl.col(col) < float(val),
+     True),
 
     # "X must be between A and B"
     (r"(\w+).*?(?:must|should)\s+be\s+between\s+(\d+(?:\.\d+)?)\s+and\s+(\d+(?:\.\d+)?)",
-     lambda col, lo, hi: f"lambda row: {lo} <= row['{col}'] <= {hi}"),
+     lambda col, lo, hi: f"lambda row: {lo} <= row['{col}'] <= {hi}",
+     lambda col, lo, hi: pl.col(col).is_between(float(lo), float(hi)),
+     True),
 
     # "X must not be empty"
     (r"(\w+).*?(?:must|should)\s+not\s+be\s+empty",
-     lambda col: f"lambda row: len(str(row['{col}'])) > 0"),
+     lambda col: f"lambda row: len(str(row['{col}'])) > 0",
+     lambda col: (pl.col(col).cast(pl.String).str.len_chars() > 0).fill_null(True),
+     False),
 
     # "X must be less than Y" (column comparison)
     (r"(\w+).*?(?:must|should)\s+be\s+(?:less|lower|smaller)\s+than\s+(\w+)",
-     lambda col1, col2: f"lambda row: row['{col1}'] < row['{col2}']"),
+     lambda col1, col2: f"lambda row: row['{col1}'] < row['{col2}']",
+     lambda col1, col2: pl.col(col1) < pl.col(col2),
+     False),
 
     # "X must be greater than Y" (column comparison)
     (r"(\w+).*?(?:must|should)\s+be\s+(?:greater|higher|more)\s+than\s+(\w+)",
-     lambda col1, col2: f"lambda row: row['{col1}'] > row['{col2}']"),
+     lambda col1, col2: f"lambda row: row['{col1}'] > row['{col2}']",
+     lambda col1, col2: pl.col(col1) > pl.col(col2),
+     False),
 
     # "X must equal Y" / "X must be Y"
     (r"(\w+).*?(?:must|should)\s+(?:equal|be)\s+[\"']([^\"']+)[\"']",
-     lambda col, val: f"lambda row: str(row['{col}']) == '{val}'"),
+     lambda col, val: f"lambda row: str(row['{col}']) == '{val}'",
+     lambda col, val: pl.col(col).cast(pl.String) == val,
+     False),
 ]
+FALLBACK_PATTERNS = [(re.compile(pattern, re.IGNORECASE), *rest) for pattern, *rest in FALLBACK_PATTERNS]
+
+
+# Allow access to built-in functions needed for string/date operations
+SAFE_BUILTINS = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "len": len,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "bool": bool,
+    "list": list,
+    "set": set,
+    "True": True,
+    "False": False,
+    "None": None,
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_lambda(lambda_str: str):
+    """eval() a rule lambda once; repeated rules (every Generate click) reuse the callable."""
+    try:
+        return eval(lambda_str, {"__builtins__": SAFE_BUILTINS}, {})
+    except Exception:
+        return None
+
+
+class _RowView:
+    """
+    Read-only `row['col']` access into column lists, so per-row rule lambdas
+    don't need a dict per row. The index is advanced in place by the caller.
+    """
+
+    __slots__ = ("_columns", "index")
+
+    def __init__(self, columns: dict):
+        self._columns = columns
+        self.index = 0
+
+    def __getitem__(self, name):
+        return self._columns[name][self.index]
+
+    def get(self, name, default=None):
+        column = self._columns.get(name)
+        return default if column is None else column[self.index]
+
+
+class _RecordStream:
+    """
+    Incremental parser for a streamed `{"records": [{...}, ...]}` response.
+
+    feed() takes response text as it arrives and returns the record objects
+    completed so far, so a batch cut off by num_predict still yields the
+    records that were finished before the cut.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._start = 0
+        self._in_str = False
+        self._escaped = False
+
+    def feed(self, text: str) -> list:
+        records = []
+        self._buf += text
+        buf, i = self._buf, self._pos
+        if not self._in_array:
+            # Skip everything before the "records" key, including other arrays or strings with "["
+            match = _RECORDS_KEY.search(buf, i)
+            if match is None:
+                # Keep a tail in case the key is split across feeds
+                keep_from = max(i, len(buf) - 32)
+                self._buf, self._pos = buf[keep_from:], 0
+                return records
+            self._in_array = True
+            i = match.end()
+        while i < len(buf) and not self._done:
+            ch = buf[i]
+            if self._in_str:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = self._depth > 0
+            elif ch == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        records.append(_json_loads(buf[self._start:i + 1]))
+                    except ValueError:
+                        pass
+            elif ch == "]" and self._depth == 0:
+                self._done = True
+            i += 1
+
+        # Drop text that can no longer be part of an unfinished record
+        keep_from = self._start if self._depth else i
+        self._buf, self._pos, self._start = buf[keep_from:], i - keep_from, 0
+        return records
 
 
 class LLMLogicEngine:
     """Translates natural language rules into executable filters via Ollama."""
 
-    def __init__(self, model: str = DEFAULT_MODEL, ollama_url: str = OLLAMA_URL):
+    def __init__(self, model: str = DEFAULT_MODEL, ollama_url: str = OLLAMA_URL,
+                 batch_size: int = None, keep_alive: str = DEFAULT_KEEP_ALIVE):
         self.model = model
         self.ollama_url = ollama_url
+        # Records per generation request; None sizes batches from the context window
+        self.batch_size = batch_size
+        self.keep_alive = keep_alive
         self._available = None
+        # (monotonic timestamp, model names or None if unreachable) from the last /api/tags probe
+        self._tags_cache = (float("-inf"), None)
+        # model -> (monotonic expiry, context length) from /api/show; lookups that fell
+        # back to the default expire after TAGS_TTL_SECONDS, real ones never do
+        self._context_lengths = {}
+        # Persistent session so keep-alive connections survive across calls
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            # Retry transient gateway errors only; connect, read and other errors fail
+            # fast so a down or hung Ollama never costs more than one timeout
+            max_retries=Retry(
+                total=3, connect=0, read=0, other=0, backoff_factor=0.5,
+                status_forcelist=[502, 503, 504], allowed_methods=None, raise_on_status=False,
+            ),
+        ))
+        # (model, rule_text, schema items) -> lambda string, for LLM translations only
+        self._translation_cache = {}
+        # blake2b of (scope, model, schema, descriptions, batch_size) -> record batches already generated,
+        # least recently used first and bounded by the GENERATION_CACHE_* limits
+        self._generation_cache = OrderedDict()
+        self._generation_lock = threading.Lock()
 
     def is_available(self) -> bool:
-        """Check if Ollama is reachable."""
-        if self._available is not None:
-            return self._available
-        try:
-            resp = requests.get("http://localhost:11434/api/tags", timeout=3)
-            self._available = resp.status_code == 200
-        except (requests.ConnectionError, requests.Timeout):
-            self._available = False
+        """Check if Ollama is reachable (cached for TAGS_TTL_SECONDS; a down server never stalls the UI)."""
+        self._available = self._refresh_tags() is not None
         return self._available
 
     def get_available_models(self) -> list:
         """Get list of models pulled in Ollama."""
+        return list(self._refresh_tags() or [])
+
+    def _refresh_tags(self):
+        """
+        Model names from /api/tags, or None if Ollama is unreachable.
+
+        One request serves as both the availability probe and the model list,
+        and its result is reused for TAGS_TTL_SECONDS.
+        """
+        checked_at, models = self._tags_cache
+        if time.monotonic() - checked_at < TAGS_TTL_SECONDS:
+            return models
+
+        models = None
         try:
-            resp = requests.get("http://localhost:11434/api/tags", timeout=3)
+            # Short connect timeout for the probe, longer read timeout for the listing
+            resp = self._session.get(OLLAMA_TAGS_URL, timeout=(0.25, 3))
             if resp.status_code == 200:
-                data = resp.json()
-                return [m["name"] for m in data.get("models", [])]
-        except (requests.ConnectionError, requests.Timeout):
+                models = [m["name"] for m in resp.json().get("models", [])]
+        except (requests.ConnectionError, requests.Timeout, ValueError):
+            pass
+        self._tags_cache = (time.monotonic(), models)
+        return models
+
+    def get_context_length(self) -> int:
+        """
+        Get the context window of the selected model (falls back to a conservative default).
+
+        Cached per model; /api/show is not called while Ollama is unreachable.
+        """
+        expires_at, length = self._context_lengths.get(self.model, (float("-inf"), None))
+        if time.monotonic() < expires_at:
+            return length
+
+        length = None
+        if self.is_available():
+            try:
+                resp = self._session.post(
+                    self.ollama_url.rsplit("/api/", 1)[0] + "/api/show",
+                    json={"model": self.model}, timeout=3,
+                )
+                if resp.status_code == 200:
+                    model_info = resp.json().get("model_info", {})
+                    for key, value in model_info.items():
+                        if key.endswith(".context_length"):
+                            length = int(value)
+                            break
+            except (requests.ConnectionError, requests.Timeout, ValueError):
+                pass
+
+        if length is None:
+            self._context_lengths[self.model] = (time.monotonic() + TAGS_TTL_SECONDS, DEFAULT_CONTEXT_LENGTH)
+            return DEFAULT_CONTEXT_LENGTH
+        self._context_lengths[self.model] = (float("inf"), length)
+        return length
+
+    def _context_window(self) -> int:
+        """Context size to request from Ollama (num_ctx): the model's own, capped at MAX_NUM_CTX."""
+        return min(self.get_context_length(), MAX_NUM_CTX)
+
+    def _batch_size(self, schema: dict, num_ctx: int) -> int:
+        """Records per request, sized so prompt + output fit in `num_ctx` tokens."""
+        if self.batch_size:
+            return self.batch_size
+        tokens_per_record = 15 * len(schema) + 10
+        # Leave half the context for the prompt itself
+        fit = (num_ctx // 2) // tokens_per_record
+        return max(1, min(MAX_BATCH_SIZE, fit))
+
+    def generate_data(self, schema: dict, count: int, field_descriptions: dict = None,
+                      max_concurrency: int = 8, offset: int = 0, use_cache: bool = False,
+                      cache_scope: str = "") -> list:
+        """
+        Generate `count` records with the LLM.
+
+        All fields are described in one prompt and each request returns a whole
+        batch of records, so HTTP calls scale with count / batch_size rather
+        than rows × fields. Up to `max_concurrency` batch requests are in flight
+        at once (threads sharing the pooled session); results keep batch order.
+
+        Replay is opt-in: with `use_cache`, records generated earlier for the
+        same `cache_scope` (e.g. a UI session), model, schema, descriptions and
+        batch size are replayed: the call returns cached records
+        [offset, offset + count) and only requests the part not cached yet.
+        Chunked callers pass their running `offset` so chunks don't repeat.
+        The cache is an LRU capped at GENERATION_CACHE_MAX_RECORDS records in
+        total; requests ending past that cap bypass it. Without `use_cache`
+        every call returns freshly generated records.
+
+        Returns a list of row dicts (possibly fewer than `count`; empty if Ollama is down).
+        """
+        if count <= 0:
+            return []
+
+        num_ctx = self._context_window()
+        batch_size = self._batch_size(schema, num_ctx)
+        key = None
+        if use_cache and offset + count <= GENERATION_CACHE_MAX_RECORDS:
+            key = self._generation_key(schema, field_descriptions, batch_size, cache_scope)
+            with self._generation_lock:
+                cached = self._generation_cache.setdefault(key, [])
+                self._generation_cache.move_to_end(key)
+        else:
+            cached, offset = [], 0
+
+        missing = offset + count - len(cached)
+        if missing > 0 and self.is_available():
+            batches_needed = math.ceil(missing / batch_size)
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, batches_needed))) as pool:
+                batches = pool.map(
+                    lambda _: self._generate_batch(schema, batch_size, field_descriptions, num_ctx),
+                    range(batches_needed),
+                )
+                generated = [record for batch in batches for record in batch]
+            # Concurrent callers may share this list; appends and reads stay under the lock
+            with self._generation_lock:
+                cached.extend(generated)
+            if key is not None:
+                self._evict_generations(key)
+        with self._generation_lock:
+            return cached[offset:offset + count]
+
+    def _evict_generations(self, keep: str):
+        """Drop least recently used generations until the cache is within its bounds."""
+        with self._generation_lock:
+            cache = self._generation_cache
+            total = sum(len(records) for records in cache.values())
+            while len(cache) > 1 and (len(cache) > GENERATION_CACHE_MAX_ENTRIES
+                                      or total > GENERATION_CACHE_MAX_RECORDS):
+                oldest = next(iter(cache))
+                if oldest == keep:
+                    cache.move_to_end(keep)
+                    continue
+                total -= len(cache.pop(oldest))
+
+    def _generation_key(self, schema: dict, field_descriptions: dict, batch_size: int,
+                        cache_scope: str = "") -> str:
+        """Stable cache key for a generation request."""
+        request = {"c": cache_scope, "m": self.model, "s": schema, "d": field_descriptions or {}, "n": batch_size}
+        return hashlib.blake2b(json.dumps(request, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+    def _generate_batch(self, schema: dict, batch_size: int, field_descriptions: dict = None,
+                        num_ctx: int = DEFAULT_CONTEXT_LENGTH) -> list:
+        """Ask the LLM for one batch of records as a JSON array."""
+        field_descriptions = field_descriptions or {}
+        field_lines = []
+        for col, dtype in schema.items():
+            desc = (field_descriptions.get(col) or "").strip()
+            field_lines.append(f"- {col} ({dtype})" + (f": {desc}" if desc else ""))
+        prompt = (
+            f"{GENERATION_PROMPT}\nFields:\n" + "\n".join(field_lines) +
+            f"\n\nGenerate {batch_size} records.\n"
+        )
+
+        parser = _RecordStream()
+        records, parts = [], []
+        try:
+            # Stream tokens so records are parsed as soon as each one is complete
+            with self._session.post(
+                self.ollama_url,
+                json={
+                    "model": self.model,
+                    "prompt": prompt,
+                    "format": "json",
+                    "stream": True,
+                    "keep_alive": self.keep_alive,
+                    "options": {
+                        "temperature": 0.8,
+                        "num_ctx": num_ctx,
+                        "num_predict": 40 * len(schema) * batch_size,
+                    },
+                },
+                timeout=180,
+                stream=True,
+            ) as resp:
+                if resp.status_code != 200:
+                    return []
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    text = chunk.get("response", "")
+                    parts.append(text)
+                    records.extend(parser.feed(text))
+                    if chunk.get("done"):
+                        break
+        except (requests.RequestException, ValueError):
+            # Keep whatever was parsed before the stream broke off
             pass
-        return []
+
+        if not records:
+            # Fall back to parsing the whole response, e.g. a bare array wrapped in fences
+            raw = "".join(parts)
+            # Strip markdown fences some models add despite format=json
+            raw = _FENCE_CLOSE.sub("", _FENCE_OPEN.sub("", raw)).strip()
+            try:
+                payload = _json_loads(raw)
+            except ValueError:
+                return []
+            records = payload.get("records", []) if isinstance(payload, dict) else payload
+
+        if not isinstance(records, list):
+            return []
+        return [
+            {col: record.get(col) for col in schema}
+            for record in records
+            if isinstance(record, dict)
+        ]
 
     def _try_fallback(self, rule_text: str, schema: dict) -> str:
         """Try to match the rule against known patterns without needing the LLM."""
-        rule_lower = rule_text.lower().strip()
+        return self._fallback_forms(rule_text, schema)[0]
 
-        for pattern_entry in FALLBACK_PATTERNS:
-            pattern = pattern_entry[0]
-            builder = pattern_entry[1]
+    def _fallback_forms(self, rule_text: str, schema: dict) -> tuple:
+        """
+        Match the rule against the fallback patterns.
 
-            match = re.search(pattern, rule_lower, re.IGNORECASE)
+        Returns (lambda_str, pl.Expr) from the first usable pattern, or (None, None);
+        the expression is None when it would not match the lambda's semantics.
+        """
+        rule_lower = rule_text.lower().strip()
+
+        for pattern, builder, expr_builder, numeric_only in FALLBACK_PATTERNS:
+            match = pattern.search(rule_lower)
             if match:
                 groups = match.groups()
                 # Validate that matched column names exist in schema
@@ -146,11 +556,17 @@ class LLMLogicEngine:
                     # Rebuild groups with actual column name
                     adjusted = (actual_col,) + groups[1:]
                     try:
-                        return builder(*adjusted)
-                    except TypeError:
+                        lambda_str = builder(*adjusted)
+                        # Numeric-literal comparisons only match the lambda on Int/Float
+                        # columns; elsewhere the rule is scored through the lambda itself
+                        dtype = str(schema[actual_col])
+                        numeric = "Int" in dtype or "Float" in dtype
+                        expr = expr_builder(*adjusted) if numeric or not numeric_only else None
+                        return lambda_str, expr
+                    except (TypeError, ValueError):
                         pass
 
-        return None
+        return None, None
 
     def translate_rule(self, rule_text: str, schema: dict) -> str:
         """
@@ -158,38 +574,63 @@ class LLMLogicEngine:
         
         Tries fallback pattern matching first, then falls back to LLM.
         """
-        # 1. Try fallback patterns first (fast, no LLM needed)
-        fallback = self._try_fallback(rule_text, schema)
-        if fallback:
-            return fallback
+        return self.translate_rules([rule_text], schema)[0]
 
-        # 2. Try LLM
-        if not self.is_available():
-            return None
+    def translate_rules(self, rules: list, schema: dict) -> list:
+        """
+        Translate a list of natural language rules into lambda strings.
+
+        Rules matched by fallback patterns never reach the LLM, nor do rules the
+        LLM already translated for this model and schema; all remaining rules are
+        packed into a single Ollama request instead of one per rule.
+
+        Returns a list aligned with `rules` (None for untranslatable rules).
+        """
+        schema_key = tuple(schema.items())
+        cache_keys = [(self.model, rule_text, schema_key) for rule_text in rules]
+
+        # 1. Try fallback patterns first (fast, no LLM needed), then earlier LLM answers
+        translated = [
+            self._try_fallback(rule_text, schema) or self._translation_cache.get(key)
+            for rule_text, key in zip(rules, cache_keys)
+        ]
+        pending = [i for i, lambda_str in enumerate(translated) if not lambda_str]
+
+        # 2. Send every unmatched rule to the LLM in one round-trip
+        if not pending or not self.is_available():
+            return translated
 
         column_info = ", ".join([f"{col} ({dtype})" for col, dtype in schema.items()])
-        prompt = f"{SYSTEM_PROMPT}\n\nAvailable columns: {column_info}\n\nRule: {rule_text}\n"
+        numbered = "\n".join(f"{n}. {rules[i]}" for n, i in enumerate(pending, start=1))
+        prompt = (
+            f"{SYSTEM_PROMPT}\n{BATCH_PROMPT}\n"
+            f"Available columns: {column_info}\n\nRules:\n{numbered}\n"
+        )
 
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 self.ollama_url,
                 json={
                     "model": self.model,
                     "prompt": prompt,
+                    "format": "json",
                     "stream": False,
-                    "options": {"temperature": 0.1, "num_predict": 150},
+                    "keep_alive": self.keep_alive,
+                    "options": {"temperature": 0.1, "num_predict": 150 * len(pending)},
                 },
                 timeout=60,
             )
             if resp.status_code == 200:
                 raw = resp.json().get("response", "").strip()
-                result = self._extract_lambda(raw)
-                if result:
-                    return result
-        except (requests.ConnectionError, requests.Timeout):
+                lambdas = _json_loads(raw).get("lambdas", [])
+                for i, candidate in zip(pending, lambdas):
+                    translated[i] = self._extract_lambda(str(candidate))
+                    if translated[i]:
+                        self._translation_cache[cache_keys[i]] = translated[i]
+        except (requests.ConnectionError, requests.Timeout, ValueError, AttributeError):
             pass
 
-        return None
+        return translated
 
     def _extract_lambda(self, raw_text: str) -> str:
         """Extract a clean lambda expression from LLM output."""
@@ -227,28 +668,7 @@ class LLMLogicEngine:
         """Safely compile a lambda string into a callable function."""
         if not lambda_str or "lambda row:" not in lambda_str:
             return None
-        try:
-            # Allow access to built-in functions needed for string/date operations
-            safe_builtins = {
-                "str": str,
-                "int": int,
-                "float": float,
-                "len": len,
-                "abs": abs,
-                "min": min,
-                "max": max,
-                "round": round,
-                "bool": bool,
-                "list": list,
-                "set": set,
-                "True": True,
-                "False": False,
-                "None": None,
-            }
-            fn = eval(lambda_str, {"__builtins__": safe_builtins}, {})
-            return fn
-        except Exception:
-            return None
+        return _compile_lambda(lambda_str)
 
     def apply_rules(self, df: pl.DataFrame, rules: list, schema: dict) -> tuple:
         """
@@ -265,13 +685,11 @@ class LLMLogicEngine:
         results = []
         compiled_rules = []
 
-        # Compile all rules first
-        for rule_text in rules:
-            rule_text = rule_text.strip()
-            if not rule_text:
-                continue
+        # Translate all rules in one pass, then compile
+        rules = [r.strip() for r in rules if r.strip()]
+        lambda_strs = self.translate_rules(rules, schema)
 
-            lambda_str = self.translate_rule(rule_text, schema)
+        for rule_text, lambda_str in zip(rules, lambda_strs):
             if not lambda_str:
                 results.append({
                     "rule": rule_text,
@@ -293,63 +711,92 @@ class LLMLogicEngine:
                 })
                 continue
 
-            compiled_rules.append((rule_text, lambda_str, fn))
+            # Fallback-translated rules also have a Polars expression; LLM rules get None
+            expr = self._fallback_forms(rule_text, schema)[1]
+            compiled_rules.append((rule_text, lambda_str, fn, expr))
 
         if not compiled_rules:
             return df, results
 
         # Apply all rules: keep compliant rows, regenerate non-compliant ones
         engine = ForgeEngine()
-        target_count = len(df)
         max_retries = 5
 
-        rows = df.to_dicts()
-        final_rows = []
+        mask = self._passes_all_mask(df, compiled_rules)
+        n_bad = int((~mask).sum())
         total_regenerated = 0
+        result_df = df
+
+        if n_bad:
+            # One batch of candidates for every failing row, filtered in a single pass
+            candidates = engine.generate_records(schema, n_bad * max_retries)
+            replacements = candidates.filter(pl.Series(self._passes_all_mask(candidates, compiled_rules))).head(n_bad)
+            total_regenerated = len(replacements)
+            # Keep the original row for any failure we couldn't replace
+            unreplaced = df.filter(pl.Series(~mask)).slice(total_regenerated)
+            result_df = pl.concat(
+                [df.filter(pl.Series(mask)), replacements, unreplaced],
+                how="vertical_relaxed",
+            )
 
-        for row in rows:
-            if self._row_passes_all(row, compiled_rules):
-                final_rows.append(row)
-            else:
-                # Try to regenerate a compliant row
-                replaced = False
-                for attempt in range(max_retries):
-                    new_row_df = engine.generate_records(schema, 1)
-                    new_row = new_row_df.to_dicts()[0]
-                    if self._row_passes_all(new_row, compiled_rules):
-                        final_rows.append(new_row)
-                        total_regenerated += 1
-                        replaced = True
-                        break
-                if not replaced:
-                    # Keep original row if we can't find a compliant one
-                    final_rows.append(row)
-
-        # If we still need more rows (shouldn't happen, but safety net)
-        result_df = pl.DataFrame(final_rows) if final_rows else df.clear()
-
-        for rule_text, lambda_str, fn in compiled_rules:
+        for rule_text, lambda_str, fn, expr in compiled_rules:
             # Count how many rows in the final result pass this rule
-            passing = sum(1 for r in final_rows if self._safe_check(r, fn))
+            passing = int(self._rule_mask(result_df, fn, expr).sum())
             results.append({
                 "rule": rule_text,
                 "lambda": lambda_str,
                 "success": True,
                 "error": None,
                 "rows_regenerated": total_regenerated,
-                "compliance_rate": f"{round(100 * passing / len(final_rows), 1)}%" if final_rows else "N/A",
+                "compliance_rate": f"{round(100 * passing / len(result_df), 1)}%" if len(result_df) else "N/A",
             })
 
         return result_df, results
 
-    def _row_passes_all(self, row: dict, compiled_rules: list) -> bool:
-        """Check if a row passes all compiled rules."""
-        for _, _, fn in compiled_rules:
-            if not self._safe_check(row, fn):
-                return False
-        return True
+    def _passes_all_mask(self, df: pl.DataFrame, compiled_rules: list) -> np.ndarray:
+        """Boolean mask of the rows in `df` that pass every compiled rule."""
+        exprs = [expr for _, _, _, expr in compiled_rules]
+        if all(expr is not None for expr in exprs):
+            # Every rule came from a fallback pattern: one combined columnar pass
+            try:
+                combined = pl.all_horizontal([expr.fill_null(False) for expr in exprs])
+                return df.select(combined).to_series().to_numpy()
+            except pl.exceptions.PolarsError:
+                pass
+
+        mask = np.ones(len(df), dtype=bool)
+        columns = {}
+        for _, _, fn, expr in compiled_rules:
+            mask &= self._rule_mask(df, fn, expr, columns)
+        return mask
+
+    def _rule_mask(self, df: pl.DataFrame, fn, expr: pl.Expr = None, columns: dict = None) -> np.ndarray:
+        """
+        Boolean mask of the rows in `df` that pass a single rule.
 
-    def _safe_check(self, row: dict, fn) -> bool:
+        Uses the rule's Polars expression (one columnar pass) when it has one and the
+        column types allow it; otherwise calls the lambda on each row through a
+        _RowView over `columns` (column lists, filled on first use and reusable
+        across rules).
+        """
+        if expr is not None:
+            try:
+                return df.select(expr.fill_null(False)).to_series().to_numpy()
+            except pl.exceptions.PolarsError:
+                pass
+
+        if columns is None:
+            columns = {}
+        if not columns:
+            columns.update((name, df.get_column(name).to_list()) for name in df.columns)
+        row = _RowView(columns)
+        mask = np.empty(len(df), dtype=bool)
+        for i in range(len(df)):
+            row.index = i
+            mask[i] = self._safe_check(row, fn)
+        return mask
+
+    def _safe_check(self, row, fn) -> bool:
         """Safely check a row against a rule function."""
         try:
             return bool(fn(row))
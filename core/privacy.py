@@ -7,7 +7,48 @@ potential privacy leaks (exact or near-exact matches).
 
 import polars as pl
 import numpy as np
-from scipy.spatial.distance import cdist
+from core.columns import EPOCH_ORDINAL
+
+try:
+    import faiss  # optional: SIMD nearest-neighbor search (pip install faiss-cpu)
+except ImportError:
+    faiss = None
+
+try:
+    from core._dcr_numba import nearest_index as _numba_nearest  # optional (pip install numba)
+except ImportError:
+    _numba_nearest = None
+
+# Below this many features the Numba loop beats the BLAS kernel
+NUMBA_MAX_FEATURES = 8
+
+try:
+    import torch  # optional: GPU (CUDA/MPS) nearest-neighbor search
+except ImportError:
+    torch = None
+
+# Rows sampled per side for DCR; a GPU makes the exhaustive search cheap enough for more
+MAX_DCR_ROWS = 5000
+MAX_DCR_ROWS_GPU = 100_000
+
+
+def _torch_device():
+    """CUDA or MPS device when torch is installed and one is available, else None."""
+    if torch is None:
+        return None
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return torch.device("mps")
+    return None
+
+
+def _min_max(expr: pl.Expr) -> pl.Expr:
+    """Scale to [0, 1]; constant columns become all zeros."""
+    # Range computed once (the ptp of the column) and reused for the guard and the divisor
+    lo = expr.min()
+    span = expr.max() - lo
+    return pl.when(span > 0).then((expr - lo) / span).otherwise(0.0)
 
 
 class PrivacyScorecard:
@@ -20,58 +61,36 @@ class PrivacyScorecard:
         - Numeric columns: normalized to [0, 1]
         - String/categorical columns: label-encoded then normalized
         - Date columns: converted to ordinal integers then normalized
-        """
-        arrays = []
-        for col in df.columns:
-            dtype = str(df[col].dtype)
 
+        All columns are encoded in a single Polars select (no Python-level loops).
+        """
+        exprs = []
+        for col, dtype in df.schema.items():
+            dtype = str(dtype)
             if "Int" in dtype or "Float" in dtype:
-                vals = df[col].cast(pl.Float64).fill_null(0.0).to_numpy()
-                vmin, vmax = vals.min(), vals.max()
-                if vmax > vmin:
-                    vals = (vals - vmin) / (vmax - vmin)
-                else:
-                    vals = np.zeros_like(vals)
-                arrays.append(vals)
-
+                exprs.append(_min_max(pl.col(col).cast(pl.Float64).fill_null(0.0)))
             elif "Date" in dtype or "Datetime" in dtype:
-                # Convert dates to ordinal
-                try:
-                    date_series = df[col].cast(pl.Date)
-                    ordinals = np.array([
-                        d.toordinal() if d is not None else 0
-                        for d in date_series.to_list()
-                    ], dtype=np.float64)
-                    omin, omax = ordinals.min(), ordinals.max()
-                    if omax > omin:
-                        ordinals = (ordinals - omin) / (omax - omin)
-                    else:
-                        ordinals = np.zeros_like(ordinals)
-                    arrays.append(ordinals)
-                except Exception:
-                    pass  # Skip unparseable date columns
-
+                # Proleptic ordinal (date.toordinal()); nulls encode as 0
+                ordinals = pl.col(col).cast(pl.Date).to_physical().cast(pl.Float64) + EPOCH_ORDINAL
+                exprs.append(_min_max(ordinals.fill_null(0.0)))
             else:
                 # String/categorical: label encode
-                unique_vals = df[col].fill_null("__NULL__").unique().to_list()
-                val_map = {v: i for i, v in enumerate(unique_vals)}
-                encoded = np.array([
-                    val_map.get(v, 0)
-                    for v in df[col].fill_null("__NULL__").to_list()
-                ], dtype=np.float64)
-                emax = max(len(unique_vals) - 1, 1)
-                encoded = encoded / emax
-                arrays.append(encoded)
-
-        if not arrays:
+                labels = pl.col(col).cast(pl.String).fill_null("__NULL__")
+                codes = labels.rank("dense").cast(pl.Float64) - 1.0
+                exprs.append(codes / pl.max_horizontal(labels.n_unique() - 1, 1))
+
+        if not exprs:
             return np.zeros((len(df), 1))
 
-        return np.column_stack(arrays)
+        return df.select(exprs).to_numpy().astype(np.float64, copy=False)
 
-    def compute_dcr(self, real_df: pl.DataFrame, synthetic_df: pl.DataFrame) -> dict:
+    def compute_dcr(self, real_df, synthetic_df) -> dict:
         """
         Compute Distance to Closest Record metrics.
 
+        Accepts eager DataFrames or LazyFrames; lazy inputs are collected
+        with the streaming engine on the shared columns only.
+
         Returns a dict with:
         - min_dcr: minimum DCR across all synthetic records
         - mean_dcr: average DCR
@@ -79,10 +98,12 @@ class PrivacyScorecard:
         - std_dcr: standard deviation of DCR
         - pct_exact_matches: % of synthetic records with DCR ≈ 0
         - risk_level: "High" / "Medium" / "Low"
-        - dcr_values: array of all DCR values (for histogram)
+        - dcr_values: NumPy array of all DCR values (for histogram)
         """
         # Use only shared columns
-        shared_cols = [c for c in real_df.columns if c in synthetic_df.columns]
+        real_cols = real_df.collect_schema().names()
+        syn_cols = set(synthetic_df.collect_schema().names())
+        shared_cols = [c for c in real_cols if c in syn_cols]
         if not shared_cols:
             return {
                 "min_dcr": None,
@@ -95,24 +116,16 @@ class PrivacyScorecard:
                 "error": "No shared columns between real and synthetic data.",
             }
 
-        real_sub = real_df.select(shared_cols)
-        syn_sub = synthetic_df.select(shared_cols)
-
-        # Sample if too large (performance guard)
-        max_rows = 5000
-        if len(real_sub) > max_rows:
-            real_sub = real_sub.sample(max_rows, seed=42)
-        if len(syn_sub) > max_rows:
-            syn_sub = syn_sub.sample(max_rows, seed=42)
+        # Sample if too large (performance guard); lazy inputs are thinned before collecting
+        max_rows = MAX_DCR_ROWS_GPU if _torch_device() is not None else MAX_DCR_ROWS
+        real_sub = self._collect_sample(real_df.select(shared_cols), max_rows)
+        syn_sub = self._collect_sample(synthetic_df.select(shared_cols), max_rows)
 
         real_matrix = self._prepare_matrix(real_sub)
         syn_matrix = self._prepare_matrix(syn_sub)
 
-        # Compute pairwise Euclidean distances
-        distances = cdist(syn_matrix, real_matrix, metric="euclidean")
-
-        # For each synthetic record, find the closest real record
-        min_distances = distances.min(axis=1)
+        # For each synthetic record, find the distance to the closest real record
+        min_distances = self._nearest_distances(syn_matrix, real_matrix)
 
         min_dcr = float(np.min(min_distances))
         mean_dcr = float(np.mean(min_distances))
@@ -139,6 +152,124 @@ class PrivacyScorecard:
             "std_dcr": round(std_dcr, 6),
             "pct_exact_matches": pct_exact,
             "risk_level": risk_level,
-            "dcr_values": min_distances.tolist(),
+            "dcr_values": min_distances,
+            "real_rows_analyzed": len(real_sub),
+            "synthetic_rows_analyzed": len(syn_sub),
             "error": None,
         }
+
+    @staticmethod
+    def _nearest_distances(syn_matrix: np.ndarray, real_matrix: np.ndarray) -> np.ndarray:
+        """
+        Euclidean distance from each synthetic row to its nearest real row.
+
+        Uses torch on a CUDA/MPS device when available, then a Faiss flat L2
+        index when faiss is installed, then the Numba kernel for narrow
+        matrices, otherwise a blocked NumPy GEMM kernel.
+        """
+        device = _torch_device()
+        if device is not None:
+            return PrivacyScorecard._torch_min_dcr(syn_matrix, real_matrix, device)
+
+        if faiss is not None and len(syn_matrix) and len(real_matrix):
+            real32 = np.ascontiguousarray(real_matrix, dtype=np.float32)
+            syn32 = np.ascontiguousarray(syn_matrix, dtype=np.float32)
+            index = faiss.IndexFlatL2(real32.shape[1])
+            index.add(real32)
+            # Faiss only picks the nearest real row; distances are exact float64
+            _, nearest = index.search(syn32, 1)
+            return PrivacyScorecard._exact_distances(syn_matrix, real_matrix, nearest[:, 0])
+
+        if _numba_nearest is not None and syn_matrix.shape[1] < NUMBA_MAX_FEATURES and len(real_matrix):
+            # Numba only picks the nearest real row; distances are exact float64
+            nearest = _numba_nearest(
+                np.ascontiguousarray(syn_matrix, dtype=np.float32),
+                np.ascontiguousarray(real_matrix, dtype=np.float32),
+            )
+            return PrivacyScorecard._exact_distances(syn_matrix, real_matrix, nearest)
+
+        return PrivacyScorecard._min_dcr_blocked(syn_matrix, real_matrix)
+
+    @staticmethod
+    def _min_dcr_blocked(syn: np.ndarray, real: np.ndarray, block: int = 1024) -> np.ndarray:
+        """
+        Row-wise min Euclidean distance via ||a||² + ||b||² - 2·a·bᵀ.
+
+        Real rows are processed `block` at a time, so only an N×block float32
+        tile exists at once and each tile is one BLAS sgemm. The float32 pass
+        only picks each row's nearest neighbour; the returned distance is then
+        recomputed exactly in float64 (so identical rows give exactly 0).
+        """
+        if len(syn) == 0 or len(real) == 0:
+            return np.full(len(syn), np.inf)
+
+        syn32 = np.ascontiguousarray(syn, dtype=np.float32)
+        real32 = np.ascontiguousarray(real, dtype=np.float32)
+        syn_sq = np.einsum("ij,ij->i", syn32, syn32)
+        real_sq = np.einsum("ij,ij->i", real32, real32)
+
+        rows = np.arange(len(syn32))
+        running_min = np.full(len(syn32), np.inf, dtype=np.float32)
+        nearest = np.zeros(len(syn32), dtype=np.int64)
+        for j0 in range(0, len(real32), block):
+            tile = real32[j0:j0 + block]
+            d2 = syn32 @ tile.T
+            d2 *= -2.0
+            d2 += syn_sq[:, None]
+            d2 += real_sq[j0:j0 + block][None, :]
+            tile_arg = d2.argmin(axis=1)
+            tile_min = d2[rows, tile_arg]
+            closer = tile_min < running_min
+            running_min[closer] = tile_min[closer]
+            nearest[closer] = tile_arg[closer] + j0
+
+        return PrivacyScorecard._exact_distances(syn, real, nearest)
+
+    @staticmethod
+    def _torch_min_dcr(syn: np.ndarray, real: np.ndarray, device, batch: int = 4096) -> np.ndarray:
+        """
+        Row-wise min Euclidean distance with torch.cdist on a GPU.
+
+        Synthetic rows go `batch` at a time (VRAM ~ batch × len(real) floats);
+        the GPU only picks the nearest real row, distances are exact float64.
+        """
+        if len(syn) == 0 or len(real) == 0:
+            return np.full(len(syn), np.inf)
+
+        real_t = torch.from_numpy(np.ascontiguousarray(real, dtype=np.float32)).to(device)
+        nearest = np.empty(len(syn), dtype=np.int64)
+        with torch.no_grad():
+            for i0 in range(0, len(syn), batch):
+                syn_t = torch.from_numpy(np.ascontiguousarray(syn[i0:i0 + batch], dtype=np.float32)).to(device)
+                nearest[i0:i0 + batch] = torch.cdist(syn_t, real_t).argmin(dim=1).cpu().numpy()
+        return PrivacyScorecard._exact_distances(syn, real, nearest)
+
+    @staticmethod
+    def _exact_distances(syn: np.ndarray, real: np.ndarray, nearest: np.ndarray) -> np.ndarray:
+        """float64 distance from each synthetic row to the real row chosen as its nearest."""
+        return np.linalg.norm(np.asarray(syn, dtype=np.float64) - np.asarray(real, dtype=np.float64)[nearest], axis=1)
+
+    @staticmethod
+    def _collect_sample(df, max_rows: int) -> pl.DataFrame:
+        """
+        Collect at most `max_rows` rows.
+
+        LazyFrames are counted first and thinned with gather_every, so the
+        streaming engine never materializes more than ~2 × max_rows rows of a
+        large upload; the remainder is trimmed with a seeded random sample.
+        """
+        if isinstance(df, pl.LazyFrame):
+            n_rows = df.select(pl.len()).collect(engine="streaming").item()
+            if n_rows > max_rows:
+                df = df.gather_every(n_rows // max_rows)
+        df = PrivacyScorecard._collect(df)
+        if len(df) > max_rows:
+            df = df.sample(max_rows, seed=42)
+        return df
+
+    @staticmethod
+    def _collect(df) -> pl.DataFrame:
+        """Materialize a LazyFrame with the streaming engine; pass DataFrames through."""
+        if isinstance(df, pl.LazyFrame):
+            return df.collect(engine="streaming")
+        return df
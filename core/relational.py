@@ -6,8 +6,9 @@ and ensures foreign key consistency across synthetic tables.
 """
 
 import polars as pl
-from faker import Faker
+import numpy as np
 from collections import defaultdict, deque
+from core.columns import random_column
 
 
 class RelationalEngine:
@@ -25,22 +26,35 @@ class RelationalEngine:
     def __init__(self):
         self.tables = {}        # name -> schema dict
         self.relationships = [] # list of (parent_table, parent_col, child_table, child_col)
-        self.fake = Faker()
+        self._rng = np.random.default_rng()
+        self._dag_cache = None   # topological order, reset whenever tables/relationships change
+        self._fk_by_child = None # child table -> {child_col: (parent_table, parent_col)}
 
     def add_table(self, name: str, schema: dict):
         """Register a table with its schema."""
         self.tables[name] = schema
+        self._invalidate()
 
     def add_relationship(self, parent_table: str, parent_col: str,
                          child_table: str, child_col: str):
         """Define a foreign key relationship."""
         self.relationships.append((parent_table, parent_col, child_table, child_col))
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop the cached DAG order and FK index after a schema change."""
+        self._dag_cache = None
+        self._fk_by_child = None
 
     def build_dag(self) -> list:
         """
         Topological sort of tables based on FK relationships.
         Returns ordered list of table names (parents first).
+        The order is cached until the next add_table/add_relationship.
         """
+        if self._dag_cache is not None:
+            return list(self._dag_cache)
+
         # Build adjacency list
         graph = defaultdict(list)
         in_degree = {name: 0 for name in self.tables}
@@ -69,49 +83,36 @@ class RelationalEngine:
                 "Cannot determine generation order."
             )
 
-        return order
+        self._dag_cache = order
+        return list(order)
 
-    def _generate_table(self, table_name: str, schema: dict, count: int,
-                        fk_pools: dict) -> pl.DataFrame:
+    def _build_fk_index(self) -> dict:
+        """Cached map of child table -> {child_col: (parent_table, parent_col)}."""
+        if self._fk_by_child is None:
+            fk_by_child = defaultdict(dict)
+            for parent, pcol, child, ccol in self.relationships:
+                fk_by_child[child][ccol] = (parent, pcol)
+            self._fk_by_child = dict(fk_by_child)
+        return self._fk_by_child
+
+    def _generate_table(self, schema: dict, count: int, fk_pools: dict,
+                        fk_sources: dict) -> pl.DataFrame:
         """
-        Generate a single table's data.
+        Generate a single table's data, one vectorized column at a time.
 
-        fk_pools: dict mapping (table_name, column_name) -> list of valid FK values
+        fk_pools: dict mapping (table_name, column_name) -> pl.Series of valid FK values
+        fk_sources: this table's FK columns, child_col -> (parent_table, parent_col)
         """
-        data = []
-        # Identify which columns in this table are FK children
-        fk_sources = {}
-        for parent, pcol, child, ccol in self.relationships:
-            if child == table_name:
-                fk_sources[ccol] = (parent, pcol)
-
-        for _ in range(count):
-            row = {}
-            for col, dtype in schema.items():
-                if col in fk_sources:
-                    # Use a value from the parent's generated pool
-                    parent_table, parent_col = fk_sources[col]
-                    pool = fk_pools.get((parent_table, parent_col), [])
-                    if pool:
-                        row[col] = self.fake.random_element(pool)
-                    else:
-                        row[col] = self._generate_value(dtype)
-                else:
-                    row[col] = self._generate_value(dtype)
-            data.append(row)
-
-        return pl.DataFrame(data)
-
-    def _generate_value(self, dtype: str):
-        """Generate a single fake value based on type string."""
-        if "Int" in dtype:
-            return self.fake.random_int(0, 10000)
-        elif "Float" in dtype:
-            return self.fake.pyfloat(right_digits=2, positive=True)
-        elif "Date" in dtype:
-            return self.fake.date_this_decade()
-        else:
-            return self.fake.word()
+        columns = {}
+        for col, dtype in schema.items():
+            pool = fk_pools.get(fk_sources[col]) if col in fk_sources else None
+            if pool is not None and len(pool):
+                # Sample values from the parent's generated pool in one gather
+                columns[col] = pool.gather(self._rng.integers(0, len(pool), count))
+            else:
+                columns[col] = random_column(self._rng, dtype, count)
+
+        return pl.DataFrame(columns)
 
     def generate_all(self, counts: dict) -> dict:
         """
@@ -124,6 +125,7 @@ class RelationalEngine:
             dict mapping table_name -> pl.DataFrame
         """
         order = self.build_dag()
+        fk_index = self._build_fk_index()
         results = {}
         fk_pools = {}
 
@@ -131,12 +133,13 @@ class RelationalEngine:
             schema = self.tables[table_name]
             count = counts.get(table_name, 100)
 
-            df = self._generate_table(table_name, schema, count, fk_pools)
+            df = self._generate_table(schema, count, fk_pools, fk_index.get(table_name, {}))
             results[table_name] = df
 
             # Register this table's columns as potential FK pools for children
             for parent, pcol, child, ccol in self.relationships:
                 if parent == table_name and pcol in df.columns:
-                    fk_pools[(table_name, pcol)] = df[pcol].unique().to_list()
+                    # Kept as a typed Series: no Python list round-trip per pool
+                    fk_pools[(table_name, pcol)] = df[pcol].unique()
 
         return results
@@ -6,10 +6,140 @@ to various storage backends without intermediate disk writes.
 """
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.dataset as ds
 import os
 import io
 import math
+import queue
+from urllib.parse import quote
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Concurrent part uploads per S3 push (each part is an independent PUT)
+MAX_UPLOAD_WORKERS = 16
+# Each in-flight upload holds one encoded part in memory; concurrency is lowered
+# so in-flight parts (sized by their uncompressed estimate) stay within this budget
+UPLOAD_BUFFER_BUDGET_BYTES = 256 * 1024 * 1024
+
+# Large parts keep file counts (and per-file footer / PUT overhead) low
+DEFAULT_RECORDS_PER_FILE = 100_000
+# Parquet encoding shared by every sink: zstd with column statistics
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+ROW_GROUP_SIZE = 100_000
+
+
+def _write_parquet_dataset(df: pl.DataFrame, base_dir: str, records_per_file: int,
+                           partitions: list, part_offsets: dict = None,
+                           filesystem=None) -> list:
+    """
+    Write Hive-partitioned Parquet with pyarrow.dataset.
+
+    Partitioning, batching and encoding all run in Arrow's threaded C++ writer,
+    which streams each partition out without materialising per-group frames.
+    Partition columns are encoded in the directory names (Hive convention)
+    and, unlike the CSV/JSON writers, are not stored inside the Parquet files:
+    read them back with hive partitioning enabled (pl.scan_parquet(...,
+    hive_partitioning=True) or pyarrow.dataset with partitioning="hive").
+    part_offsets follows the DataSink.push contract, keyed by base_dir.
+
+    Returns the written paths (relative to `filesystem` when one is given).
+    """
+    table = df.to_arrow()
+    basename = _part_basename(base_dir, part_offsets) + ".parquet"
+
+    written_paths = []
+    ds.write_dataset(
+        table,
+        base_dir=base_dir,
+        format="parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression=PARQUET_COMPRESSION,
+            compression_level=PARQUET_COMPRESSION_LEVEL,
+            write_statistics=True,
+        ),
+        partitioning=ds.partitioning(
+            pa.schema([table.schema.field(col) for col in partitions]), flavor="hive"
+        ),
+        basename_template=basename,
+        max_rows_per_file=records_per_file,
+        max_rows_per_group=min(records_per_file, ROW_GROUP_SIZE),
+        existing_data_behavior="overwrite_or_ignore",
+        filesystem=filesystem,
+        use_threads=True,
+        file_visitor=lambda written_file: written_paths.append(written_file.path),
+    )
+    return written_paths
+
+
+def _part_basename(base: str, part_offsets: dict = None) -> str:
+    """
+    File name template ("{i}" = file index) for one partitioned push under `base`.
+
+    Successive chunks (tracked in part_offsets) get their own file prefix so
+    earlier parts survive. Matches _write_parquet_dataset for every format.
+    """
+    if part_offsets is None:
+        return "part_{i}"
+    chunk_idx = part_offsets.get(base, 0)
+    part_offsets[base] = chunk_idx + 1
+    return f"part_{chunk_idx}_{{i}}"
+
+
+def _hive_groups(df: pl.DataFrame, partitions: list) -> list:
+    """
+    Split a frame into (Hive path segments, group frame) pairs.
+
+    Values are formatted and URI-escaped as Arrow's Hive partitioning does
+    (nulls become __HIVE_DEFAULT_PARTITION__), so CSV/JSON directories match
+    the Parquet dataset writer's.
+    """
+    arrow_types = {field.name: field.type for field in df.select(partitions).head(0).to_arrow().schema}
+    groups = []
+    for group_vals, group_df in df.partition_by(partitions, as_dict=True).items():
+        segments = []
+        for col, val in zip(partitions, group_vals):
+            if val is None:
+                text = "__HIVE_DEFAULT_PARTITION__"
+            else:
+                text = quote(pa.array([val], type=arrow_types[col]).cast(pa.string())[0].as_py(), safe="")
+            segments.append(f"{col}={text}")
+        groups.append((segments, group_df))
+    return groups
+
+
+def _write_parquet(batch: pl.DataFrame, target):
+    """Write one Parquet part (path or file object) with the shared encoding settings."""
+    batch.write_parquet(
+        target,
+        compression=PARQUET_COMPRESSION,
+        compression_level=PARQUET_COMPRESSION_LEVEL,
+        statistics=True,
+        row_group_size=max(1, min(len(batch), ROW_GROUP_SIZE)),
+    )
+
+
+def _batch_names(df: pl.DataFrame, out_dir: str, file_format: str, records_per_file: int,
+                 part_offsets: dict = None, basename: str = None) -> list:
+    """(batch, file name) pairs for splitting `df` into parts of `records_per_file` rows."""
+    num_files = max(1, math.ceil(len(df) / records_per_file))
+    ext = {"parquet": "parquet", "csv": "csv", "json": "json"}.get(file_format, "parquet")
+    start = 0
+    if basename is None:
+        basename = "part_{i}"
+        if part_offsets is not None:
+            start = part_offsets.get(out_dir, 0)
+            part_offsets[out_dir] = start + num_files
+
+    names = []
+    for j in range(num_files):
+        batch = df.slice(j * records_per_file, records_per_file)
+        if len(batch) == 0:
+            continue
+        names.append((batch, f"{basename.format(i=start + j)}.{ext}"))
+    return names
 
 
 class DataSink(ABC):
@@ -17,66 +147,148 @@ class DataSink(ABC):
 
     @abstractmethod
     def push(self, df: pl.DataFrame, destination: str, file_format: str = "parquet",
-             records_per_file: int = 250, partitions: list = None) -> list:
+             records_per_file: int = DEFAULT_RECORDS_PER_FILE, partitions: list = None,
+             part_offsets: dict = None) -> list:
         """
         Push a DataFrame to the sink.
 
+        part_offsets: optional dict of output dir/prefix -> next part index,
+        updated in place so repeated pushes never overwrite earlier parts.
+
         Returns list of paths/URIs written.
         """
         pass
 
+    def push_stream(self, chunks, destination: str, file_format: str = "parquet",
+                    records_per_file: int = DEFAULT_RECORDS_PER_FILE, partitions: list = None) -> list:
+        """
+        Push an iterator of DataFrame chunks, overlapping production with writes.
+
+        A single writer thread drains a bounded queue (backpressure of 2 chunks),
+        so the producer never runs more than two chunks ahead of the sink.
+
+        Returns list of paths/URIs written.
+        """
+        pending = queue.Queue(maxsize=2)
+
+        def _drain() -> list:
+            part_offsets = {}
+            written = []
+            while True:
+                chunk = pending.get()
+                if chunk is None:
+                    return written
+                written.extend(self.push(chunk, destination, file_format, records_per_file,
+                                         partitions, part_offsets=part_offsets))
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            writer = pool.submit(_drain)
+            producer_error = None
+            try:
+                for chunk in chunks:
+                    self._enqueue(pending, chunk, writer)
+            except BaseException as exc:
+                producer_error = exc
+            # Always send the sentinel so the writer exits even if the producer raised
+            self._enqueue(pending, None, writer)
+            written = writer.result()
+            if producer_error is not None:
+                raise producer_error
+            return written
+
+    @staticmethod
+    def _enqueue(pending: queue.Queue, item, writer):
+        """Put onto the bounded queue, surfacing writer errors instead of blocking forever."""
+        while True:
+            try:
+                pending.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if writer.done():
+                    writer.result()
+
 
 class LocalSink(DataSink):
     """Write data to the local filesystem."""
 
     def push(self, df: pl.DataFrame, destination: str, file_format: str = "parquet",
-             records_per_file: int = 250, partitions: list = None) -> list:
+             records_per_file: int = DEFAULT_RECORDS_PER_FILE, partitions: list = None,
+             part_offsets: dict = None) -> list:
         """Write DataFrame to local disk with optional partitioning."""
         destination = os.path.abspath(os.path.expanduser(destination))
-        written_paths = []
-
+        if partitions and file_format == "parquet":
+            return _write_parquet_dataset(df, destination, records_per_file, partitions, part_offsets)
         if partitions:
-            # Group by all partition columns for full Hive-style nesting
-            groups = df.group_by(partitions)
-            for group_vals, group_df in groups:
-                # Build nested Hive path
-                if isinstance(group_vals, tuple):
-                    path_parts = [f"{col}={val}" for col, val in zip(partitions, group_vals)]
-                else:
-                    path_parts = [f"{partitions[0]}={group_vals}"]
-                nested_dir = os.path.join(destination, *path_parts)
-                paths = self._write_batches(group_df, nested_dir, file_format, records_per_file)
-                written_paths.extend(paths)
-        else:
-            written_paths = self._write_batches(df, destination, file_format, records_per_file)
+            return self.push_parallel(df, destination, file_format, records_per_file,
+                                      partitions, part_offsets)
+
+        return self._write_batches(df, destination, file_format, records_per_file, part_offsets)
 
-        return written_paths
+    def push_parallel(self, df: pl.DataFrame, destination: str, file_format: str = "parquet",
+                      records_per_file: int = DEFAULT_RECORDS_PER_FILE, partitions: list = None,
+                      part_offsets: dict = None) -> list:
+        """
+        Write every Hive partition's part files on one shared thread pool.
+
+        Encoding releases the GIL, so partitions overlap CPU and disk I/O.
+        """
+        destination = os.path.abspath(os.path.expanduser(destination))
+        basename = _part_basename(destination, part_offsets)
+        jobs = []
+        for path_parts, group_df in _hive_groups(df, partitions):
+            # Build nested Hive path
+            nested_dir = os.path.join(destination, *path_parts)
+            jobs.extend(self._batch_jobs(group_df, nested_dir, file_format, records_per_file,
+                                         basename=basename))
+        return self._write_jobs(jobs, file_format)
 
     def _write_batches(self, df: pl.DataFrame, out_dir: str,
-                       file_format: str, records_per_file: int) -> list:
+                       file_format: str, records_per_file: int,
+                       part_offsets: dict = None) -> list:
         """Split and write a DataFrame in batches."""
-        os.makedirs(out_dir, exist_ok=True)
-        paths = []
-        num_files = max(1, math.ceil(len(df) / records_per_file))
+        return self._write_jobs(self._batch_jobs(df, out_dir, file_format, records_per_file, part_offsets),
+                                file_format)
 
-        for i in range(num_files):
-            batch = df.slice(i * records_per_file, records_per_file)
-            if len(batch) == 0:
-                continue
-
-            ext = {"parquet": "parquet", "csv": "csv", "json": "json"}.get(file_format, "parquet")
-            filepath = os.path.join(out_dir, f"part_{i}.{ext}")
+    @staticmethod
+    def _batch_jobs(df: pl.DataFrame, out_dir: str, file_format: str,
+                    records_per_file: int, part_offsets: dict = None, basename: str = None) -> list:
+        """
+        Split a DataFrame into (batch, path) write jobs under `out_dir`.
 
-            if file_format == "csv":
-                batch.write_csv(filepath)
-            elif file_format == "json":
-                batch.write_json(filepath)
-            else:
-                batch.write_parquet(filepath)
+        Files are named part_<n> (numbered on from part_offsets), or from the
+        `basename` template when given (see _part_basename).
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        return [(batch, os.path.join(out_dir, name))
+                for batch, name in _batch_names(df, out_dir, file_format, records_per_file,
+                                                part_offsets, basename)]
 
-            paths.append(filepath)
+    def _write_jobs(self, jobs: list, file_format: str) -> list:
+        """
+        Write (batch, path) jobs on a single thread pool of at most cpu_count workers.
 
-        return paths
+        Polars releases the GIL while encoding, so independent part files are
+        written in parallel.
+        """
+        if len(jobs) <= 1:
+            return [self._write_one(batch, filepath, file_format) for batch, filepath in jobs]
+
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self._write_one, batch, filepath, file_format)
+                       for batch, filepath in jobs]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _write_one(batch: pl.DataFrame, filepath: str, file_format: str) -> str:
+        """Write a single part file; returns its path."""
+        if file_format == "csv":
+            batch.write_csv(filepath)
+        elif file_format == "json":
+            batch.write_json(filepath)
+        else:
+            _write_parquet(batch, filepath)
+        return filepath
 
 
 class S3Sink(DataSink):
@@ -86,64 +298,86 @@ class S3Sink(DataSink):
         self.bucket = bucket
         self.prefix = prefix.strip("/")
         self.region = region
+        self._s3 = None
+
+    def _client(self):
+        """boto3 S3 client, created once per sink (clients are thread-safe)."""
+        if self._s3 is None:
+            try:
+                import boto3
+            except ImportError:
+                raise ImportError(
+                    "boto3 is required for S3 sink. Install it with: pip install boto3"
+                )
+            self._s3 = boto3.client("s3", region_name=self.region)
+        return self._s3
 
     def push(self, df: pl.DataFrame, destination: str = "", file_format: str = "parquet",
-             records_per_file: int = 250, partitions: list = None) -> list:
+             records_per_file: int = DEFAULT_RECORDS_PER_FILE, partitions: list = None,
+             part_offsets: dict = None) -> list:
         """Stream DataFrame directly to S3."""
-        try:
-            import boto3
-        except ImportError:
-            raise ImportError(
-                "boto3 is required for S3 sink. Install it with: pip install boto3"
-            )
-
-        s3 = boto3.client("s3", region_name=self.region)
-        written_keys = []
-
         base_prefix = f"{self.prefix}/{destination}".strip("/") if destination else self.prefix
 
+        if partitions and file_format == "parquet":
+            # Arrow's dataset writer streams each partition straight to S3
+            paths = _write_parquet_dataset(df, f"{self.bucket}/{base_prefix}".rstrip("/"),
+                                           records_per_file, partitions, part_offsets,
+                                           filesystem=self._filesystem())
+            return [f"s3://{path}" for path in paths]
+
         if partitions:
-            groups = df.group_by(partitions)
-            for group_vals, group_df in groups:
-                if isinstance(group_vals, tuple):
-                    path_parts = "/".join(f"{col}={val}" for col, val in zip(partitions, group_vals))
-                else:
-                    path_parts = f"{partitions[0]}={group_vals}"
-                nested_prefix = f"{base_prefix}/{path_parts}"
-                keys = self._upload_batches(s3, group_df, nested_prefix, file_format, records_per_file)
-                written_keys.extend(keys)
+            basename = _part_basename(base_prefix, part_offsets)
+            jobs = []
+            for path_parts, group_df in _hive_groups(df, partitions):
+                jobs.extend(self._batch_jobs(group_df, f"{base_prefix}/{'/'.join(path_parts)}",
+                                             file_format, records_per_file, basename=basename))
         else:
-            written_keys = self._upload_batches(s3, df, base_prefix, file_format, records_per_file)
-
-        return written_keys
-
-    def _upload_batches(self, s3, df: pl.DataFrame, prefix: str,
-                        file_format: str, records_per_file: int) -> list:
-        """Upload batches directly to S3 from memory."""
-        keys = []
-        num_files = max(1, math.ceil(len(df) / records_per_file))
-
-        for i in range(num_files):
-            batch = df.slice(i * records_per_file, records_per_file)
-            if len(batch) == 0:
-                continue
-
-            ext = {"parquet": "parquet", "csv": "csv", "json": "json"}.get(file_format, "parquet")
-            key = f"{prefix}/part_{i}.{ext}"
-
-            buf = io.BytesIO()
-            if file_format == "csv":
-                buf.write(batch.write_csv().encode("utf-8") if isinstance(batch.write_csv(), str) else batch.write_csv())
-            elif file_format == "json":
-                buf.write(batch.write_json().encode("utf-8") if isinstance(batch.write_json(), str) else batch.write_json())
-            else:
-                batch.write_parquet(buf)
+            jobs = self._batch_jobs(df, base_prefix, file_format, records_per_file, part_offsets)
+        return self._upload_jobs(jobs, file_format)
+
+    def _filesystem(self):
+        """pyarrow S3 filesystem for dataset writes (same default AWS credential chain as boto3)."""
+        from pyarrow.fs import S3FileSystem
+        return S3FileSystem(region=self.region)
+
+    def _batch_jobs(self, df: pl.DataFrame, prefix: str, file_format: str,
+                    records_per_file: int, part_offsets: dict = None, basename: str = None) -> list:
+        """Split a DataFrame into (batch, key) upload jobs under `prefix` (naming as LocalSink._batch_jobs)."""
+        return [(batch, f"{prefix}/{name}")
+                for batch, name in _batch_names(df, prefix, file_format, records_per_file,
+                                                part_offsets, basename)]
+
+    def _upload_jobs(self, jobs: list, file_format: str) -> list:
+        """
+        Upload batches directly to S3 from memory.
 
-            buf.seek(0)
-            s3.upload_fileobj(buf, self.bucket, key)
-            keys.append(f"s3://{self.bucket}/{key}")
+        Batches are encoded and uploaded on up to MAX_UPLOAD_WORKERS threads,
+        so encoding one part overlaps with the network transfer of others.
+        Every worker holds one encoded part, so the worker count is also capped
+        to keep in-flight buffers within UPLOAD_BUFFER_BUDGET_BYTES (at least one).
+        """
+        if not jobs:
+            return []
+        s3 = self._client()
+        part_bytes = max(batch.estimated_size() for batch, _ in jobs)
+        max_workers = max(1, min(MAX_UPLOAD_WORKERS, len(jobs), UPLOAD_BUFFER_BUDGET_BYTES // max(part_bytes, 1)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self._upload_one, s3, batch, key, file_format) for batch, key in jobs]
+            return [future.result() for future in futures]
+
+    def _upload_one(self, s3, batch: pl.DataFrame, key: str, file_format: str) -> str:
+        """Encode one batch into memory and upload it; returns its s3:// URI."""
+        buf = io.BytesIO()
+        if file_format == "csv":
+            batch.write_csv(buf)
+        elif file_format == "json":
+            batch.write_json(buf)
+        else:
+            _write_parquet(batch, buf)
 
-        return keys
+        buf.seek(0)
+        s3.upload_fileobj(buf, self.bucket, key)
+        return f"s3://{self.bucket}/{key}"
 
 
 def get_sink(sink_type: str, **kwargs) -> DataSink:
@@ -6,16 +6,16 @@ and seasonal patterns for pipeline load-testing and anomaly detection.
 """
 
 import polars as pl
-from faker import Faker
-from datetime import date, timedelta
-import math
+import numpy as np
+from datetime import date
+from core.columns import random_column
 
 
 class TimeTravelEngine:
     """Generates synthetic data with temporal patterns."""
 
     def __init__(self):
-        self.fake = Faker()
+        self._rng = np.random.default_rng()
 
     def generate_temporal(
         self,
@@ -44,11 +44,35 @@ class TimeTravelEngine:
         Returns:
             Polars DataFrame with an added '_period' column
         """
+        frames = [
+            df for _, df in self.stream_temporal(
+                schema, base_count_per_period, start_date, end_date,
+                frequency, trend_pct, spike_dates, spike_multiplier,
+            )
+        ]
+        return pl.concat(frames) if frames else pl.DataFrame()
+
+    def stream_temporal(
+        self,
+        schema: dict,
+        base_count_per_period: int,
+        start_date: date,
+        end_date: date,
+        frequency: str = "monthly",
+        trend_pct: float = 0.0,
+        spike_dates: list = None,
+        spike_multiplier: float = 3.0,
+    ):
+        """
+        Generate the same data as generate_temporal, one period at a time.
+
+        Yields (period_key, DataFrame) pairs so a sink can write each period
+        before the next is generated; periods with no records are skipped.
+        """
         if spike_dates is None:
             spike_dates = []
 
         periods = self._generate_periods(start_date, end_date, frequency)
-        all_data = []
 
         for i, (period_start, period_end) in enumerate(periods):
             # Apply trend: compound growth
@@ -61,53 +85,32 @@ class TimeTravelEngine:
                     period_count = int(period_count * multiplier)
                     break
 
-            # Generate records for this period
-            for _ in range(period_count):
-                row = {"_period": period_start.isoformat()}
-                for col, dtype in schema.items():
-                    if "Date" in dtype:
-                        # Generate dates within the period
-                        delta = (period_end - period_start).days
-                        random_days = self.fake.random_int(0, max(delta, 1))
-                        row[col] = period_start + timedelta(days=random_days)
-                    elif "Int" in dtype:
-                        row[col] = self.fake.random_int(0, 10000)
-                    elif "Float" in dtype:
-                        row[col] = self.fake.pyfloat(right_digits=2, positive=True)
-                    else:
-                        row[col] = self.fake.word()
-                all_data.append(row)
-
-        return pl.DataFrame(all_data)
+            # Generate records for this period, one vectorized column at a time
+            if period_count > 0:
+                period_key = period_start.isoformat()
+                yield period_key, self._generate_period(schema, period_key, period_start, period_end, period_count)
+
+    def _generate_period(self, schema: dict, period_key: str, period_start: date,
+                         period_end: date, count: int) -> pl.DataFrame:
+        """Generate `count` rows for one period; Date columns fall inside the period."""
+        columns = {"_period": pl.repeat(period_key, count, dtype=pl.String, eager=True)}
+        for col, dtype in schema.items():
+            columns[col] = random_column(self._rng, dtype, count, period_start, period_end)
+        return pl.DataFrame(columns)
 
     def _generate_periods(self, start: date, end: date, frequency: str) -> list:
-        """Generate list of (period_start, period_end) tuples."""
-        periods = []
-        current = start
-
-        while current < end:
-            if frequency == "daily":
-                period_end = current + timedelta(days=1)
-            elif frequency == "weekly":
-                period_end = current + timedelta(weeks=1)
-            else:  # monthly
-                # Move to same day next month
-                month = current.month + 1
-                year = current.year
-                if month > 12:
-                    month = 1
-                    year += 1
-                try:
-                    period_end = current.replace(year=year, month=month)
-                except ValueError:
-                    # Handle months with fewer days (e.g., Jan 31 -> Feb 28)
-                    period_end = current.replace(year=year, month=month, day=28)
-
-            period_end = min(period_end, end)
-            periods.append((current, period_end))
-            current = period_end
-
-        return periods
+        """
+        Generate list of (period_start, period_end) tuples.
+
+        Period starts come from one pl.date_range call; monthly steps stay
+        anchored to the start day (Jan 31 -> Feb 29 -> Mar 31) instead of drifting.
+        """
+        if start >= end:
+            return []
+        interval = {"daily": "1d", "weekly": "1w"}.get(frequency, "1mo")
+        starts = pl.date_range(start, end, interval=interval, closed="left", eager=True)
+        ends = starts.shift(-1).fill_null(end)
+        return list(zip(starts.to_list(), ends.to_list()))
 
     def get_volume_preview(
         self,
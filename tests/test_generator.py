@@ -0,0 +1,29 @@
+import re
+
+import pytest
+
+from core.generator import ForgeEngine, SMART_PROVIDERS, _resolve_provider
+
+
+def _first_listed_match(col_lower: str):
+    for pattern, provider in SMART_PROVIDERS:
+        if re.search(pattern, col_lower):
+            return provider
+    return None
+
+
+@pytest.mark.parametrize("column", [
+    "email", "user_email", "phone_number", "first_name", "last_name", "name", "username",
+    "address", "city", "state", "zip_code", "website_url", "ip_address", "company_name",
+    "job_title", "description", "uuid", "credit_card", "currency", "favorite_color",
+    # Several patterns match: the first listed one must win
+    "email_domain", "company_description", "billing_city_state", "org_url",
+])
+def test_smart_provider_regex_keeps_list_precedence(column):
+    assert _resolve_provider(column, "String") is _first_listed_match(column)
+
+
+def test_unmatched_and_non_string_columns_fall_back_to_dtype():
+    assert _first_listed_match("quantity") is None
+    assert _resolve_provider("quantity", "String")(ForgeEngine().fake)
+    assert _resolve_provider("email", "Int64") not in [provider for _, provider in SMART_PROVIDERS]
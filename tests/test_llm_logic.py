@@ -0,0 +1,46 @@
+from core.llm_logic import _RecordStream
+
+
+def _feed_all(parts) -> list:
+    parser = _RecordStream()
+    records = []
+    for part in parts:
+        records.extend(parser.feed(part))
+    return records
+
+
+def test_record_stream_single_feed():
+    assert _feed_all(['{"records": [{"a": 1}, {"a": 2}]}']) == [{"a": 1}, {"a": 2}]
+
+
+def test_record_stream_chunked_feeds():
+    text = '{"records": [{"a": 1, "b": {"c": 2}}, {"a": 3, "b": {"c": 4}}]}'
+    expected = [{"a": 1, "b": {"c": 2}}, {"a": 3, "b": {"c": 4}}]
+    for size in (1, 2, 3, 7):
+        assert _feed_all([text[i:i + size] for i in range(0, len(text), size)]) == expected
+
+
+def test_record_stream_braces_and_quotes_inside_strings():
+    text = r'{"records": [{"s": "a } { ] [ b"}, {"s": "say \"hi\" }"}, {"s": "back\\"}]}'
+    assert _feed_all([text[i:i + 4] for i in range(0, len(text), 4)]) == [
+        {"s": "a } { ] [ b"}, {"s": 'say "hi" }'}, {"s": "back\\"},
+    ]
+
+
+def test_record_stream_truncated_output_keeps_finished_records():
+    assert _feed_all(['{"records": [{"a": 1}, {"a": 2}, {"a": 3, "b": "unfini']) == [{"a": 1}, {"a": 2}]
+
+
+def test_record_stream_yields_each_record_once():
+    parser = _RecordStream()
+    assert parser.feed('{"records": [{"a": 1}') == [{"a": 1}]
+    assert parser.feed(', {"a": 2}') == [{"a": 2}]
+    assert parser.feed("]}") == []
+    assert parser.feed(', {"a": 3}') == []
+
+
+def test_record_stream_ignores_brackets_before_records_key():
+    assert _feed_all(['{"note": "[x]", "records": [{"a": 1}]}']) == [{"a": 1}]
+    assert _feed_all(['{"meta": [{"k": 0}], "records": [{"a": 1}]}']) == [{"a": 1}]
+    text = '{"meta": [1, 2], "records" : [{"a": 1}]}'
+    assert _feed_all(list(text)) == [{"a": 1}]
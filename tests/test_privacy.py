@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from core.privacy import PrivacyScorecard
+
+
+def _brute_force(syn: np.ndarray, real: np.ndarray) -> np.ndarray:
+    return np.sqrt(((syn[:, None, :] - real[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+
+
+@pytest.mark.parametrize("n_real", [1, 7, 8, 9, 25])
+def test_min_dcr_blocked_matches_brute_force_across_block_edges(n_real):
+    rng = np.random.default_rng(0)
+    syn = rng.random((13, 4))
+    real = rng.random((n_real, 4))
+    result = PrivacyScorecard._min_dcr_blocked(syn, real, block=8)
+    np.testing.assert_allclose(result, _brute_force(syn, real), rtol=1e-12)
+
+
+def test_min_dcr_blocked_exact_duplicates_are_zero():
+    rng = np.random.default_rng(1)
+    real = rng.random((20, 3))
+    syn = np.vstack([real[[3, 11, 19]], rng.random((2, 3))])
+    result = PrivacyScorecard._min_dcr_blocked(syn, real, block=8)
+    assert result.dtype == np.float64
+    assert (result[:3] == 0.0).all()
+    np.testing.assert_allclose(result, _brute_force(syn, real), rtol=1e-12)
+
+
+def test_min_dcr_blocked_empty_real_is_infinite():
+    result = PrivacyScorecard._min_dcr_blocked(np.zeros((2, 3)), np.zeros((0, 3)))
+    assert np.isinf(result).all()
+
+
+def test_numba_backend_returns_exact_distances():
+    numba_kernel = pytest.importorskip("core._dcr_numba")
+    rng = np.random.default_rng(2)
+    real = rng.random((30, 3))
+    syn = np.vstack([real[:2], rng.random((10, 3))])
+    nearest = numba_kernel.nearest_index(syn.astype(np.float32), real.astype(np.float32))
+    result = PrivacyScorecard._exact_distances(syn, real, nearest)
+    assert (result[:2] == 0.0).all()
+    np.testing.assert_allclose(result, _brute_force(syn, real), rtol=1e-12)
@@ -0,0 +1,30 @@
+import polars as pl
+import pytest
+
+from core.sinks import LocalSink
+
+
+def test_push_stream_reraises_producer_error(tmp_path):
+    def chunks():
+        yield pl.DataFrame({"id": [1, 2, 3]})
+        raise RuntimeError("chunk failed")
+
+    with pytest.raises(RuntimeError, match="chunk failed"):
+        LocalSink().push_stream(chunks(), str(tmp_path))
+
+    assert list(tmp_path.glob("*.parquet"))
+
+
+def test_partitioned_layout_matches_across_formats(tmp_path):
+    df = pl.DataFrame({"region": ["a b", "x/y", None], "value": [1, 2, 3]})
+    layouts = {}
+    for file_format in ("parquet", "csv", "json"):
+        out_dir = tmp_path / file_format
+        sink, part_offsets = LocalSink(), {}
+        for _ in range(2):
+            sink.push(df, str(out_dir), file_format, partitions=["region"], part_offsets=part_offsets)
+        layouts[file_format] = sorted(
+            str(path.relative_to(out_dir).with_suffix("")) for path in out_dir.rglob("part_*")
+        )
+    assert layouts["parquet"] == layouts["csv"] == layouts["json"]
+    assert "region=__HIVE_DEFAULT_PARTITION__/part_1_0" in layouts["csv"]
@@ -0,0 +1,22 @@
+from datetime import date
+
+from core.time_travel import TimeTravelEngine
+
+
+def test_monthly_periods_stay_anchored_to_start_day():
+    periods = TimeTravelEngine()._generate_periods(date(2024, 1, 31), date(2024, 5, 1), "monthly")
+    assert [start for start, _ in periods] == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30),
+    ]
+
+
+def test_periods_are_contiguous_and_end_at_window_end():
+    for frequency in ("daily", "weekly", "monthly"):
+        periods = TimeTravelEngine()._generate_periods(date(2024, 1, 1), date(2024, 3, 10), frequency)
+        assert periods[0][0] == date(2024, 1, 1)
+        assert periods[-1][1] == date(2024, 3, 10)
+        assert all(end == next_start for (_, end), (next_start, _) in zip(periods, periods[1:]))
+
+
+def test_empty_window_has_no_periods():
+    assert TimeTravelEngine()._generate_periods(date(2024, 1, 1), date(2024, 1, 1), "daily") == []